@@ -0,0 +1,65 @@
+"""
+Microbenchmark: fast collection date parser vs the dateutil based parser it replaced.
+
+Run from the repository root (Home Assistant and the integration requirements installed):
+
+    python benchmarks/bench_dates.py
+"""
+import sys
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+from auckland_rubbish_collection.parsing import (  # noqa: E402
+    match_collection_date,
+    parse_collection_date,
+    parse_collection_date_dateutil,
+)
+
+def collection_text(day: date) -> str:
+    """Format a date the way council schedule cards show it, e.g. 'Thursday, 13 March'."""
+    return f"{day:%A}, {day.day} {day:%B}"
+
+def corpus(today: date, days=28):
+    """Collection date text for the coming weeks, as seen by an address fleet on `today`."""
+    return [collection_text(today + timedelta(days=offset)) for offset in range(days)]
+
+ROUNDS = 20
+
+def run(label, func, today, strings, clear_cache):
+    def one_pass():
+        if clear_cache:
+            match_collection_date.cache_clear()
+        for text in strings:
+            func(text, today)
+    best = min(timeit.repeat(one_pass, number=ROUNDS, repeat=5)) / (ROUNDS * len(strings))
+    print(f"{label:<28} {best * 1e6:8.2f} us/date")
+    return best
+
+def main():
+    today = date.today()
+    strings = corpus(today)
+    baseline = run("dateutil (previous)", parse_collection_date_dateutil, today, strings, False)
+    cold = run("fast path, empty memo", parse_collection_date, today, strings, True)
+    warm = run("fast path, warm memo", parse_collection_date, today, strings, False)
+    print(f"speed-up: {baseline / cold:.1f}x cold, {baseline / warm:.1f}x warm")
+
+    # Replay every day of a year (including the December to January rollover) as "today"
+    # and count how often each parser gets the upcoming collection dates wrong
+    start = today.replace(month=1, day=1)
+    wrong = {"fast": 0, "dateutil": 0}
+    total = 0
+    for offset in range(366):
+        day = start + timedelta(days=offset)
+        for ahead in range(14):
+            expected = (day + timedelta(days=ahead)).isoformat()
+            text = collection_text(day + timedelta(days=ahead))
+            wrong["fast"] += parse_collection_date(text, day) != expected
+            wrong["dateutil"] += parse_collection_date_dateutil(text, day) != expected
+            total += 1
+    print(f"wrong dates over {total} year-round cases: fast={wrong['fast']} dateutil={wrong['dateutil']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Address search: autocomplete-style typing against the local stand-in lookup endpoint,
+with and without the search index answering queries it has already covered.
+
+Every answer is checked against what the stand-in endpoint itself returns for
+the query, including queries whose shorter prefixes only got a full page of
+results, so they had to be looked up again. Exits non-zero if any differ.
+
+Run from the repository root (Home Assistant and the integration requirements installed):
+
+    python benchmarks/bench_search.py [--addresses 50] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "custom_components"))
+sys.path.insert(0, str(HERE))
+
+from auckland_rubbish_collection.address_search import (  # noqa: E402
+    MAX_RESULTS,
+    MIN_QUERY_LENGTH,
+    AucklandRubbishAddressIndex,
+)
+from server import async_start_server, make_addresses, search_addresses  # noqa: E402
+
+def typing_sequences(count, seed=1):
+    """Queries sent while typing each of count addresses a character at a time."""
+    rng = random.Random(seed)
+    targets = rng.sample(make_addresses(), count)
+    return [
+        (address_id, [address[:length] for length in range(MIN_QUERY_LENGTH, len(address) + 1)])
+        for address_id, address in targets
+    ]
+
+async def run(sequences, base_url, use_index):
+    """
+    Type every sequence, returning (queries, lookups sent, seconds, targets found,
+    answers), where answers lists (query, results, looked up after its first query)
+    for checking once the timing is done.
+    """
+    queries = found = 0
+    answers = []
+    async with aiohttp.ClientSession() as session:
+        index = AucklandRubbishAddressIndex(None, session=session, base_url=base_url)
+        start = time.perf_counter()
+        for address_id, typed in sequences:
+            for position, query in enumerate(typed):
+                if not use_index:
+                    index = AucklandRubbishAddressIndex(None, session=session, base_url=base_url)
+                lookups = index.lookups
+                results = await index.async_search(query)
+                queries += 1
+                # No shorter prefix had a complete result, so this one went to the site
+                answers.append((query, results, position > 0 and index.lookups > lookups))
+            found += any(match_id == address_id for match_id, _ in results)
+        elapsed = time.perf_counter() - start
+    return queries, index.lookups if use_index else queries, elapsed, found, answers
+
+def check_answers(answers):
+    """Compare each answer with the stand-in's own search, returning the queries that differ."""
+    addresses = make_addresses()
+    return [
+        query for query, results, _ in answers
+        if results != [
+            (match["ACRateAccountKey"], match["Address"])
+            for match in search_addresses(addresses, query, MAX_RESULTS)
+        ]
+    ]
+
+async def main(args):
+    runner, base_url = await async_start_server(latency=args.latency)
+    try:
+        sequences = typing_sequences(args.addresses)
+        print(f"{args.addresses} addresses typed, server latency {args.latency * 1000:.0f}ms\n")
+        print(f"{'':<12}{'queries':>9}{'lookups':>9}{'seconds':>9}{'found':>7}")
+        checked, failures = 0, []
+        for label, use_index in (("no index", False), ("index", True)):
+            queries, lookups, elapsed, found, answers = await run(sequences, base_url, use_index)
+            print(f"{label:<12}{queries:>9}{lookups:>9}{elapsed:>9.2f}{found:>7}")
+            checked += len(answers)
+            failures += [(label, query) for query in check_answers(answers)]
+            if use_index:
+                relooked = sum(1 for _, _, looked_up in answers if looked_up)
+    finally:
+        await runner.cleanup()
+
+    for label, query in failures:
+        print(f"FAIL [{label}] '{query}': results differ from the stand-in search")
+    print(
+        f"\nanswers: {checked - len(failures)} matched the stand-in search, {len(failures)} failed "
+        f"({relooked} looked up again after an incomplete prefix)"
+    )
+    if not relooked:
+        print("FAIL: no query was looked up again after an incomplete prefix, so that case went unchecked")
+    return 1 if failures or not relooked else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--addresses", type=int, default=50, help="addresses to type")
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in server latency in seconds")
+    sys.exit(asyncio.run(main(parser.parse_args())))
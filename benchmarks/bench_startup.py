@@ -0,0 +1,171 @@
+"""
+Startup cost: what importing the integration and setting up entries from the
+schedule cache costs a Home Assistant boot.
+
+Run from the repository root (Home Assistant and the integration requirements installed):
+
+    python benchmarks/bench_startup.py [--entries 100] [--repeat 5]
+
+1. Import time of the integration's modules, each run in a fresh interpreter
+   with the Home Assistant modules it uses already imported, and who loaded
+   each parsing backend (bs4, dateutil): Home Assistant itself, the
+   integration import, or nobody yet. Only a backend nobody has loaded is a
+   saving; its import cost is shown, and is paid on the first parse that
+   needs that fallback. (Home Assistant's calendar component imports dateutil,
+   so on current versions only bs4 is deferred.)
+2. Setup time per entry when every entry is restored from the schedule cache
+   (coordinator creation and cache restore), which is the usual restart path.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+HERE = Path(__file__).resolve().parent
+CUSTOM_COMPONENTS = HERE.parent / "custom_components"
+sys.path.insert(0, str(CUSTOM_COMPONENTS))
+sys.path.insert(0, str(HERE))
+
+# Home Assistant modules the integration imports, loaded before timing so only
+# the integration's own cost is measured
+HOME_ASSISTANT_MODULES = [
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.config_entries",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.calendar",
+    "homeassistant.components.diagnostics",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.selector",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+]
+INTEGRATION_MODULES = [
+    "auckland_rubbish_collection",
+    "auckland_rubbish_collection.sensor",
+    "auckland_rubbish_collection.binary_sensor",
+    "auckland_rubbish_collection.calendar",
+    "auckland_rubbish_collection.config_flow",
+    "auckland_rubbish_collection.diagnostics",
+]
+BACKEND_MODULES = {"bs4": "bs4", "dateutil": "dateutil.parser"}
+
+TIMED_IMPORT = """
+import importlib, json, sys, time
+sys.path.insert(0, {path!r})
+for name in {warm!r}:
+    importlib.import_module(name)
+preloaded = [name for name in {backends!r} if name in sys.modules]
+start = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "preloaded": preloaded,
+    "loaded": [name for name in {backends!r} if name in sys.modules],
+}}))
+"""
+
+def timed_import(modules, warm, repeat):
+    """
+    Median import time of modules in fresh interpreters, with which backends
+    the warm modules had already loaded and which were loaded afterwards.
+    """
+    code = TIMED_IMPORT.format(path=str(CUSTOM_COMPONENTS), warm=warm, modules=modules, backends=list(BACKEND_MODULES))
+    runs = [
+        json.loads(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+        for _ in range(repeat)
+    ]
+    return {
+        "ms": statistics.median(run["seconds"] for run in runs) * 1000,
+        "preloaded": set(runs[0]["preloaded"]),
+        "loaded": set(runs[0]["loaded"]),
+    }
+
+def loaded_by(name, preloaded, loaded):
+    """Who loaded a backend: Home Assistant (already there), the integration, or nobody yet."""
+    if name in preloaded:
+        return "Home Assistant"
+    return "integration" if name in loaded else "not loaded"
+
+async def measure_setup(entries):
+    """Per entry cost of setting up coordinators restored from the schedule cache."""
+    import importlib
+    from homeassistant.core import HomeAssistant
+    for name in HOME_ASSISTANT_MODULES:
+        importlib.import_module(name)
+    preloaded = {name for name in BACKEND_MODULES if name in sys.modules}
+    from auckland_rubbish_collection.cache import get_schedule_cache
+    from auckland_rubbish_collection.service import get_coordinator
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    cache = get_schedule_cache(hass)
+    await cache.async_load()
+    expected = json.loads((HERE / "fixtures" / "expected.json").read_text())
+    data = expected["standard"]["data"]
+    config_entries = []
+    for number in range(entries):
+        address_id = f"{12340000000 + number:011d}"
+        cache.async_set(address_id, data)
+        config_entries.append(SimpleNamespace(
+            entry_id=f"entry{number}",
+            data={"address_id": address_id, "address_name": f"Address {number}"},
+            options={},
+        ))
+
+    start = time.perf_counter()
+    for entry in config_entries:
+        coordinator = get_coordinator(hass, entry)
+        coordinator.async_restore_from_cache()
+    elapsed = time.perf_counter() - start
+    restored = sum(1 for entry in config_entries if hass.data["auckland_rubbish_collection"][entry.entry_id].data)
+
+    await hass.async_stop(force=True)
+    return {
+        "entries": entries,
+        "restored": restored,
+        "us_per_entry": elapsed / entries * 1e6,
+        "preloaded": preloaded,
+        "loaded": {name for name in BACKEND_MODULES if name in sys.modules},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100, help="config entries to set up")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per import measurement")
+    args = parser.parse_args()
+    logging.getLogger("auckland_rubbish_collection").setLevel(logging.CRITICAL)
+
+    integration = timed_import(INTEGRATION_MODULES, HOME_ASSISTANT_MODULES, args.repeat)
+    print(f"integration import: {integration['ms']:.1f}ms\n")
+    print(f"{'backend':<12}{'loaded by':<16}{'deferred ms':>12}")
+    for name, module in BACKEND_MODULES.items():
+        owner = loaded_by(name, integration["preloaded"], integration["loaded"])
+        if owner == "not loaded":
+            # Only a backend nobody has imported yet is actually saved at startup
+            deferred = f"{timed_import([module], HOME_ASSISTANT_MODULES, args.repeat)['ms']:.1f}"
+        else:
+            deferred = "-"
+        print(f"{name:<12}{owner:<16}{deferred:>12}")
+
+    setup = asyncio.run(measure_setup(args.entries))
+    owners = ", ".join(
+        f"{name} {loaded_by(name, setup['preloaded'], setup['loaded'])}" for name in BACKEND_MODULES
+    )
+    print(
+        f"\nsetup from cache: {setup['restored']}/{setup['entries']} entries restored, "
+        f"{setup['us_per_entry']:.0f}us each; loaded by: {owners}"
+    )
+
+if __name__ == "__main__":
+    main()
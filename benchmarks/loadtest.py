@@ -0,0 +1,238 @@
+"""
+Load test: a large fleet of config entries refreshed against recorded council pages.
+
+Run from the repository root (Home Assistant and the integration requirements installed):
+
+    python benchmarks/loadtest.py [--entries 500] [--rounds 2] [--archive ARCHIVE]
+                                  [--latency 0.05] [--jitter 0.05] [--error-rate 0.02]
+
+Each entry gets its own address and coordinator, set up the way the integration
+does it, with every fetch going through Home Assistant's aiohttp session to a
+replay of the archive (see replay.py). The replay runs on its own thread and
+event loop, so it does not count towards the lag measured here. Without
+--archive, the fixture stand-in site (server.py) is recorded to a temporary
+archive first and replayed with --fill.
+
+Every round refreshes the whole fleet as one scheduled batch; later rounds
+send conditional requests, as a real refresh a few hours on would. Reported:
+
+- throughput: entries refreshed per second, and how each refresh ended
+  (fetched, not modified, unchanged, or failed)
+- event loop lag: how late a 10ms timer on Home Assistant's loop fires during the round
+- memory per entry: what the entries hold once refreshed, traced with tracemalloc
+  (which slows allocation heavy code; --no-memory for throughput alone)
+
+A round in which no entry refreshed successfully stops the run with its first
+error, since its timings would only measure how fast requests fail.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "custom_components"))
+sys.path.insert(0, str(HERE))
+
+from auckland_rubbish_collection import service  # noqa: E402
+from replay import add_replay_arguments, async_record, async_start_replay, replay_options  # noqa: E402
+from server import async_start_server, load_fixtures  # noqa: E402
+
+LAG_INTERVAL = 0.01
+
+class ReplayThread:
+    """The replay site, served from its own thread and event loop."""
+    def __init__(self, archive, **options):
+        self.archive = archive
+        self.options = options
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="replay", daemon=True)
+        self.runner = None
+
+    def start(self) -> str:
+        self.thread.start()
+        self.runner, base_url = asyncio.run_coroutine_threadsafe(
+            async_start_replay(self.archive, **self.options), self.loop
+        ).result()
+        return base_url
+
+    @property
+    def app(self):
+        return self.runner.app
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+async def record_fixtures(archive):
+    """Record one address per fixture from the stand-in site, for replaying with fill."""
+    runner, base_url = await async_start_server()
+    try:
+        # The stand-in maps an address_id to a fixture by its value, modulo the number of schedules
+        schedules = len(load_fixtures()) - 1
+        address_ids = [f"{12300000000 + number:011d}" for number in range(schedules)]
+        await async_record(archive, address_ids, base_url, rate=100)
+    finally:
+        await runner.cleanup()
+
+async def monitor_lag(samples, stop):
+    """Append how late each LAG_INTERVAL timer fired (seconds) until stop is set."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(loop.time() - start - LAG_INTERVAL)
+
+def stop_run(reason):
+    """End the load test, rather than report throughput that measured nothing."""
+    raise SystemExit(f"load test stopped: {reason}")
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))] if ordered else 0.0
+
+async def run_round(hass, scheduler, coordinators):
+    """Refresh every coordinator as one batch, returning the round's measurements."""
+    for coordinator in coordinators:
+        # As if the coalescing window had passed since the last round
+        coordinator.fetcher.fetched = None
+    samples, stop = [], asyncio.Event()
+    monitor = hass.async_create_task(monitor_lag(samples, stop))
+    start = time.perf_counter()
+    await scheduler._async_refresh_batch(coordinators)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+
+    outcomes = Counter(coordinator.last_stats.cache for coordinator in coordinators)
+    if outcomes["error"] == len(coordinators):
+        stop_run(f"every refresh failed, the first with: {coordinators[0].last_stats.error}")
+    return {
+        "seconds": elapsed,
+        "per_second": len(coordinators) / elapsed,
+        "outcomes": outcomes,
+        "stale": sum(1 for coordinator in coordinators if coordinator.stale),
+        "lag_p50_ms": percentile(samples, 0.5) * 1000,
+        "lag_p99_ms": percentile(samples, 0.99) * 1000,
+        "lag_max_ms": max(samples, default=0.0) * 1000,
+    }
+
+async def async_start_hass():
+    """
+    A Home Assistant instance with what the integration's fetches rely on set up:
+    its aiohttp session resolves hosts through the network component, which
+    needs http (never started here, so no port is opened) and in turn auth.
+    """
+    from homeassistant import bootstrap, loader
+    from homeassistant.auth import auth_manager_from_config
+    from homeassistant.config_entries import ConfigEntries
+    from homeassistant.core import HomeAssistant
+    from homeassistant.setup import async_setup_component
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    hass.auth = await auth_manager_from_config(hass, [], [])
+    if not await async_setup_component(hass, "network", {}):
+        await hass.async_stop(force=True)
+        stop_run("could not set up Home Assistant's network component")
+    return hass
+
+async def main(args):
+    options = replay_options(args)
+    archive = args.archive
+    if archive is None:
+        archive = Path(tempfile.mkdtemp()) / "fixtures.zip"
+        await record_fixtures(archive)
+        options["fill"] = True
+    replay = ReplayThread(archive, hang=args.request_timeout * 2, **options)
+    base_url = replay.start()
+    service.REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=args.request_timeout)
+    try:
+        hass = await async_start_hass()
+    except BaseException:
+        replay.stop()
+        raise
+    try:
+        await run_load_test(args, hass, replay, base_url, options)
+    finally:
+        await hass.async_stop(force=True)
+        replay.stop()
+
+async def run_load_test(args, hass, replay, base_url, options):
+    from auckland_rubbish_collection.breaker import get_circuit_breaker
+    from auckland_rubbish_collection.cache import get_schedule_cache
+    from auckland_rubbish_collection.scheduler import get_scheduler
+    from auckland_rubbish_collection.service import get_coordinator
+
+    await get_schedule_cache(hass).async_load()
+    scheduler = get_scheduler(hass)
+
+    if not args.no_memory:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+    coordinators = []
+    for number in range(args.entries):
+        entry = SimpleNamespace(
+            entry_id=f"entry{number}",
+            data={"address_id": f"{12340000000 + number:011d}", "address_name": f"Address {number}"},
+            options={},
+        )
+        coordinator = get_coordinator(hass, entry)
+        coordinator.fetcher.base_url = base_url
+        coordinators.append(coordinator)
+
+    print(
+        f"{args.entries} entries, latency {args.latency * 1000:.0f}ms + up to {args.jitter * 1000:.0f}ms, "
+        f"error rate {args.error_rate:.1%} ({options['errors'] and ', '.join(options['errors'])})\n"
+    )
+    print(f"{'round':<7}{'seconds':>9}{'entries/s':>11}{'fetched':>9}{'not mod':>9}"
+          f"{'unchanged':>11}{'failed':>8}{'stale':>7}{'lag p50':>9}{'p99':>7}{'max':>7}")
+    for number in range(1, args.rounds + 1):
+        result = await run_round(hass, scheduler, coordinators)
+        outcomes = result["outcomes"]
+        print(
+            f"{number:<7}{result['seconds']:>9.2f}{result['per_second']:>11.1f}"
+            f"{outcomes['miss']:>9}{outcomes['not_modified']:>9}{outcomes['unchanged']:>11}"
+            f"{outcomes['error']:>8}{result['stale']:>7}"
+            f"{result['lag_p50_ms']:>9.1f}{result['lag_p99_ms']:>7.1f}{result['lag_max_ms']:>7.1f}"
+        )
+
+    if not args.no_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"\nmemory: {(current - baseline) / args.entries / 1024:.1f}KiB per entry held, "
+            f"{(peak - baseline) / 1024 / 1024:.1f}MiB peak"
+        )
+    breaker = get_circuit_breaker(hass)
+    print(
+        f"replay: {replay.app['requests']} requests, "
+        f"{sum(replay.app['errors'].values())} failed on purpose; "
+        f"circuit breaker {breaker.state}, tripped {breaker.trips} time(s)"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=500, help="config entries to set up")
+    parser.add_argument("--rounds", type=int, default=2, help="times to refresh the whole fleet")
+    parser.add_argument("--archive", default=None, help="recorded pages (see replay.py record)")
+    parser.add_argument("--request-timeout", type=float, default=5.0,
+                        help="seconds before a request is given up on (the integration uses 30)")
+    parser.add_argument("--no-memory", action="store_true", help="don't trace memory")
+    add_replay_arguments(parser)
+    args = parser.parse_args()
+    logging.getLogger("auckland_rubbish_collection").setLevel(logging.CRITICAL)
+    asyncio.run(main(args))
@@ -0,0 +1,203 @@
+"""
+Record council collection day pages to an archive, and replay them from a local
+site so large fleets of addresses can be load tested offline.
+
+The archive is a zip file with one deflated page per address (pages/<address_id>.html)
+and a manifest.json of the status and caching headers each was served with.
+
+Run from the repository root (Home Assistant and the integration requirements installed):
+
+    python benchmarks/replay.py record ARCHIVE ADDRESS_ID [ADDRESS_ID ...] [--base-url URL]
+    python benchmarks/replay.py serve ARCHIVE [--latency 0.05] [--error-rate 0.01]
+
+Recording is rate limited like the bulk address import. Replaying honours
+ETag / If-None-Match and If-Modified-Since, adds latency (fixed plus random
+jitter) before every response and fails a share of requests on purpose (see
+ERROR_KINDS). With fill, address IDs missing from the archive are served one
+of the recorded pages, so a few recordings can stand in for any number of entries.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "custom_components"))
+
+from auckland_rubbish_collection.bulk_import import IMPORT_RATE, RateLimiter  # noqa: E402
+from auckland_rubbish_collection.scheduler import MAX_CONCURRENT_FETCHES  # noqa: E402
+from auckland_rubbish_collection.service import (  # noqa: E402
+    BASE_URL,
+    PAGE_PATH,
+    REQUEST_HEADERS,
+    REQUEST_TIMEOUT,
+)
+
+MANIFEST = "manifest.json"
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# Failures that can be injected: an error status, a response that never comes
+# (the client gives up after its request timeout), or a page cut off part way
+ERROR_KINDS = ("503", "429", "timeout", "truncated")
+HANG = 3600
+
+async def async_record(archive, address_ids, base_url=BASE_URL, rate=IMPORT_RATE):
+    """
+    Fetch each address from base_url and write what was served to archive.
+    Returns {address_id: status}; pages that could not be fetched are left out.
+    """
+    limiter = RateLimiter(rate)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    manifest, pages, results = {}, {}, {}
+
+    async def record(session, address_id):
+        await limiter.async_wait()
+        async with semaphore:
+            try:
+                url = base_url + PAGE_PATH.format(address_id=address_id)
+                async with session.get(url, headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT) as response:
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                results[address_id] = str(err) or type(err).__name__
+                return
+        results[address_id] = response.status
+        pages[address_id] = body
+        manifest[address_id] = {
+            "status": response.status,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "recorded": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(record(session, address_id) for address_id in address_ids))
+
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr(MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+        for address_id, body in sorted(pages.items()):
+            zip_file.writestr(f"pages/{address_id}.html", body)
+    return results
+
+def load_archive(archive) -> dict[str, dict]:
+    """Return {address_id: {"status", "headers", "body"}} for every recorded page."""
+    with zipfile.ZipFile(archive) as zip_file:
+        manifest = json.loads(zip_file.read(MANIFEST))
+        return {
+            address_id: {**recording, "body": zip_file.read(f"pages/{address_id}.html")}
+            for address_id, recording in manifest.items()
+        }
+
+def make_replay_app(archive, latency=0.0, jitter=0.0, error_rate=0.0, errors=ERROR_KINDS,
+                    fill=False, seed=None, hang=HANG) -> web.Application:
+    """
+    Build a site serving the recorded pages. latency and jitter are in seconds;
+    error_rate is the share of requests failed with one of errors, and a "timeout"
+    holds the request for hang seconds.
+    """
+    recordings = load_archive(archive)
+    recorded_ids = sorted(recordings)
+    rng = random.Random(seed)
+    app = web.Application()
+    app["requests"] = 0
+    app["errors"] = {kind: 0 for kind in errors}
+
+    async def handle_page(request):
+        app["requests"] += 1
+        delay = latency + rng.uniform(0, jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        address_id = request.match_info["address_id"]
+        if address_id not in recordings and fill and recorded_ids and address_id.isdigit():
+            address_id = recorded_ids[int(address_id) % len(recorded_ids)]
+        recording = recordings.get(address_id)
+        if recording is None:
+            return web.Response(status=404)
+
+        kind = rng.choice(errors) if errors and rng.random() < error_rate else None
+        if kind is not None:
+            app["errors"][kind] += 1
+        if kind in ("503", "429"):
+            return web.Response(status=int(kind))
+        if kind == "timeout":
+            await asyncio.sleep(hang)
+
+        headers = dict(recording["headers"])
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if recording["status"] == 200 and (
+            (etag and request.headers.get("If-None-Match") == etag)
+            or (last_modified and request.headers.get("If-Modified-Since") == last_modified)
+        ):
+            headers.pop("Content-Type", None)
+            return web.Response(status=304, headers=headers)
+        body = recording["body"]
+        if kind == "truncated":
+            body = body[:len(body) // 3]
+        return web.Response(status=recording["status"], body=body, headers=headers)
+
+    app.router.add_get(PAGE_PATH, handle_page)
+    return app
+
+async def async_start_replay(archive, host="127.0.0.1", port=0, **kwargs):
+    """Start the replay site in the running loop, returning (runner, base_url)."""
+    runner = web.AppRunner(make_replay_app(archive, **kwargs))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://{host}:{port}"
+
+def add_replay_arguments(parser):
+    """The latency and error injection options, shared with loadtest.py."""
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added before every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests to fail (0-1)")
+    parser.add_argument("--errors", default=",".join(ERROR_KINDS),
+                        help=f"comma separated failures to inject, from {', '.join(ERROR_KINDS)}")
+    parser.add_argument("--fill", action="store_true",
+                        help="serve address IDs missing from the archive one of the recorded pages")
+    parser.add_argument("--seed", type=int, default=None, help="seed for latency jitter and errors")
+
+def replay_options(args) -> dict:
+    """make_replay_app keyword arguments from parsed add_replay_arguments options."""
+    errors = tuple(kind.strip() for kind in args.errors.split(",") if kind.strip())
+    unknown = set(errors) - set(ERROR_KINDS)
+    if unknown:
+        raise SystemExit(f"unknown error kinds: {', '.join(sorted(unknown))}")
+    return {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "errors": errors,
+        "fill": args.fill,
+        "seed": args.seed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="fetch addresses and write them to an archive")
+    record.add_argument("archive")
+    record.add_argument("address_ids", nargs="+")
+    record.add_argument("--base-url", default=BASE_URL, help="site to record from")
+    record.add_argument("--rate", type=float, default=IMPORT_RATE, help="requests started per second")
+    serve = commands.add_parser("serve", help="replay an archive on http://127.0.0.1:8099")
+    serve.add_argument("archive")
+    add_replay_arguments(serve)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        results = asyncio.run(async_record(args.archive, args.address_ids, args.base_url, args.rate))
+        for address_id in args.address_ids:
+            print(f"{address_id}  {results.get(address_id)}")
+    else:
+        web.run_app(make_replay_app(args.archive, **replay_options(args)), host="127.0.0.1", port=8099)
+
+if __name__ == "__main__":
+    main()
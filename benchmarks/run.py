@@ -0,0 +1,200 @@
+"""
+Offline regression and benchmark suite, built on the saved council pages in fixtures/.
+
+Run from the repository root (Home Assistant and the integration requirements installed):
+
+    python benchmarks/run.py [--addresses 200] [--concurrency 4]
+
+1. Regression: every fixture is parsed with each extraction engine and compared
+   with fixtures/expected.json.
+2. Parse latency and allocations per fixture and engine.
+3. End-to-end refresh throughput for N simulated addresses, fetched from the local
+   stand-in site (server.py) and parsed in executor threads.
+
+Results are written to benchmarks/results/<timestamp>.json and compared with the
+previous run; anything more than --threshold slower is reported as a regression.
+Exits non-zero if any fixture parses differently from what is expected.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from datetime import date, datetime
+from pathlib import Path
+
+import aiohttp
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "custom_components"))
+sys.path.insert(0, str(HERE))
+
+from auckland_rubbish_collection.parsing import EXTRACTION_ENGINES, parse_schedule_page  # noqa: E402
+from auckland_rubbish_collection.scheduler import MAX_CONCURRENT_FETCHES  # noqa: E402
+from auckland_rubbish_collection.service import async_read_page  # noqa: E402
+from server import FIXTURES, PAGE_PATH, async_start_server, load_fixtures  # noqa: E402
+
+RESULTS = HERE / "results"
+
+def check_regressions(pages, expected):
+    """Return a list of (fixture, engine, problem) for fixtures that don't parse as expected."""
+    failures = []
+    for name, case in expected.items():
+        today = date.fromisoformat(case["today"])
+        for engine in EXTRACTION_ENGINES:
+            _, data = parse_schedule_page(pages[name], "utf-8", today, engine)
+            if data != case["data"]:
+                failures.append((name, engine, f"got {data}"))
+    return failures
+
+def measure_parse(pages, expected):
+    """Best per-parse latency (microseconds) and allocations for each fixture and engine."""
+    latency, allocations = {}, {}
+    for name, body in pages.items():
+        today = date.fromisoformat(expected.get(name, {}).get("today", date.today().isoformat()))
+        latency[name], allocations[name] = {}, {}
+        for engine in EXTRACTION_ENGINES:
+            timer = timeit.Timer(lambda: parse_schedule_page(body, "utf-8", today, engine))
+            number, _ = timer.autorange()
+            latency[name][engine] = min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+            tracemalloc.start()
+            parse_schedule_page(body, "utf-8", today, engine)
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats = snapshot.statistics("filename")
+            allocations[name][engine] = {
+                "peak_bytes": peak,
+                "retained_blocks": sum(stat.count for stat in stats),
+            }
+    return latency, allocations
+
+async def measure_end_to_end(addresses, concurrency, latency):
+    """Fetch and parse N addresses against the local stand-in site, as a scheduled batch would."""
+    runner, base_url = await async_start_server(latency=latency)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    today = date.today()
+    received = 0
+
+    async def refresh(session, address_id):
+        nonlocal received
+        async with semaphore:
+            async with session.get(base_url + PAGE_PATH.format(address_id=address_id)) as response:
+                body = await async_read_page(response)
+                charset = response.charset
+        received += len(body)
+        return await loop.run_in_executor(None, parse_schedule_page, body, charset, today)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(
+                refresh(session, f"{12340000000 + number:011d}") for number in range(addresses)
+            ))
+            elapsed = time.perf_counter() - start
+    finally:
+        await runner.cleanup()
+
+    return {
+        "addresses": addresses,
+        "concurrency": concurrency,
+        "server_latency_ms": latency * 1000,
+        "seconds": elapsed,
+        "addresses_per_second": addresses / elapsed,
+        "bytes_received": received,
+        "parsed": sum(1 for _, data in results if data and data.get("rubbish")),
+    }
+
+def flatten(results, prefix=""):
+    """Flatten nested timing results into {"a.b.c": value} for comparison."""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def compare_with_previous(results, threshold):
+    """Compare latency figures with the most recent stored run, returning regressions found."""
+    previous_runs = sorted(RESULTS.glob("*.json"))
+    if not previous_runs:
+        return None, []
+    previous = json.loads(previous_runs[-1].read_text())
+    before = flatten(previous["parse_latency_us"])
+    after = flatten(results["parse_latency_us"])
+    regressions = [
+        f"parse {key}: {before[key]:.1f}us -> {value:.1f}us"
+        for key, value in after.items()
+        if key in before and value > before[key] * (1 + threshold)
+    ]
+    old_rate = previous["end_to_end"]["addresses_per_second"]
+    new_rate = results["end_to_end"]["addresses_per_second"]
+    if new_rate < old_rate / (1 + threshold):
+        regressions.append(f"end to end: {old_rate:.1f} -> {new_rate:.1f} addresses/s")
+    return previous_runs[-1].name, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--addresses", type=int, default=200, help="simulated addresses for the end to end run")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_FETCHES, help="concurrent fetches")
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in server latency in seconds")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slow-down reported as a regression")
+    parser.add_argument("--no-save", action="store_true", help="don't store this run's results")
+    args = parser.parse_args()
+    # The "Unknown address" fixture logs an error on every parse by design
+    logging.getLogger("auckland_rubbish_collection").setLevel(logging.CRITICAL)
+
+    pages = load_fixtures()
+    expected = json.loads((FIXTURES / "expected.json").read_text())
+
+    failures = check_regressions(pages, expected)
+    for name, engine, problem in failures:
+        print(f"FAIL {name} [{engine}]: {problem}")
+    print(f"regression: {len(expected) * len(EXTRACTION_ENGINES) - len(failures)} passed, {len(failures)} failed")
+
+    latency, allocations = measure_parse(pages, expected)
+    print(f"\n{'fixture':<18}" + "".join(f"{engine:>22}" for engine in EXTRACTION_ENGINES))
+    for name in latency:
+        cells = "".join(
+            f"{latency[name][engine]:>9.1f}us {allocations[name][engine]['peak_bytes'] / 1024:>7.1f}KiB"
+            for engine in EXTRACTION_ENGINES
+        )
+        print(f"{name:<18}{cells}")
+
+    end_to_end = asyncio.run(measure_end_to_end(args.addresses, args.concurrency, args.latency))
+    print(
+        f"\nend to end: {end_to_end['addresses']} addresses in {end_to_end['seconds']:.2f}s "
+        f"({end_to_end['addresses_per_second']:.1f}/s, {end_to_end['bytes_received'] / end_to_end['addresses'] / 1024:.1f} KiB read each)"
+    )
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "regression_failures": len(failures),
+        "parse_latency_us": latency,
+        "parse_allocations": allocations,
+        "end_to_end": end_to_end,
+    }
+    previous, regressions = compare_with_previous(results, args.threshold)
+    if previous:
+        print(f"\ncompared with {previous}: {len(regressions)} regression(s)")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+
+    if not args.no_save:
+        RESULTS.mkdir(exist_ok=True)
+        path = RESULTS / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+        path.write_text(json.dumps(results, indent=2))
+        print(f"results saved to {path.relative_to(HERE.parent)}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Local stand-in for the council collection day pages, serving the fixture corpus.
+
+Every 11-digit address_id maps to one of the schedule fixtures (anything else gets
+the "Unknown address" page), and ETag / If-None-Match is honoured so conditional
+requests can be exercised. The address lookup used by the config flow's search
+step is served from a generated list of addresses (see make_addresses).
+Run directly to serve on http://127.0.0.1:8099:
+
+    python benchmarks/server.py
+"""
+import asyncio
+import hashlib
+import itertools
+from pathlib import Path
+from aiohttp import web
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+PAGE_PATH = (
+    "/en/rubbish-recycling/rubbish-recycling-collections/"
+    "rubbish-recycling-collection-days/{address_id}.html"
+)
+UNKNOWN_FIXTURE = "unknown_address"
+SEARCH_PATH = "/_vti_bin/ACWeb/ACservices.svc/GetMatchingPropertyAddresses"
+
+STREETS = ("Queen Street", "Queens Road", "Quay Street", "Karangahape Road", "Great North Road",
+           "Great South Road", "Dominion Road", "Mount Eden Road", "Ponsonby Road", "Example Road")
+SUBURBS = ("Auckland Central", "Grey Lynn", "Mount Eden", "Ponsonby", "Waiuku")
+
+def make_addresses(per_street=60) -> list[tuple[str, str]]:
+    """A stable list of (address_id, address) for the lookup endpoint to search."""
+    addresses = []
+    for number, (street, suburb) in enumerate(itertools.product(STREETS, SUBURBS)):
+        for house in range(1, per_street + 1):
+            address_id = f"{12300000000 + number * 1000 + house:011d}"
+            addresses.append((address_id, f"{house} {street}, {suburb}"))
+    return addresses
+
+def search_addresses(addresses, text, limit):
+    """Match the way the council search box does: every word starts a word of the address."""
+    words = text.lower().replace(",", " ").split()
+    matches = []
+    for address_id, address in addresses:
+        address_words = address.lower().replace(",", " ").split()
+        if all(any(part.startswith(word) for part in address_words) for word in words):
+            matches.append({"ACRateAccountKey": address_id, "Address": address, "Suggestion": address})
+            if len(matches) >= limit:
+                break
+    return matches
+
+def load_fixtures(fixtures=FIXTURES) -> dict[str, bytes]:
+    """Return {fixture name: page bytes} for every saved page."""
+    return {path.stem: path.read_bytes() for path in sorted(fixtures.glob("*.html"))}
+
+def make_app(fixtures=FIXTURES, latency=0.0) -> web.Application:
+    """Build the stand-in site; latency (seconds) is added before every response."""
+    pages = load_fixtures(fixtures)
+    schedules = [name for name in pages if name != UNKNOWN_FIXTURE]
+    etags = {name: f'"{hashlib.sha256(body).hexdigest()[:16]}"' for name, body in pages.items()}
+    addresses = make_addresses()
+    app = web.Application()
+    app["requests"] = 0
+    app["lookups"] = 0
+
+    async def handle_page(request):
+        app["requests"] += 1
+        if latency:
+            await asyncio.sleep(latency)
+        address_id = request.match_info["address_id"]
+        if len(address_id) == 11 and address_id.isdigit():
+            name = schedules[int(address_id) % len(schedules)]
+        else:
+            name = UNKNOWN_FIXTURE
+        headers = {"ETag": etags[name]}
+        if request.headers.get("If-None-Match") == etags[name]:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=pages[name], content_type="text/html", charset="utf-8", headers=headers)
+
+    async def handle_search(request):
+        app["lookups"] += 1
+        if latency:
+            await asyncio.sleep(latency)
+        payload = await request.json()
+        limit = int(payload.get("ResultCount", 10))
+        return web.json_response(search_addresses(addresses, payload.get("SearchText", ""), limit))
+
+    app.router.add_get(PAGE_PATH, handle_page)
+    app.router.add_post(SEARCH_PATH, handle_search)
+    return app
+
+async def async_start_server(host="127.0.0.1", port=0, **kwargs):
+    """Start the stand-in site in the running loop, returning (runner, base_url)."""
+    runner = web.AppRunner(make_app(**kwargs))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://{host}:{port}"
+
+if __name__ == "__main__":
+    web.run_app(make_app(), host="127.0.0.1", port=8099)
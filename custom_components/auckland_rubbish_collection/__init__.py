@@ -1,8 +1,64 @@
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-from .const import DOMAIN, _LOGGER
-from .service import get_coordinator
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from .bulk_import import async_import_addresses, read_addresses_csv
+from .cache import get_schedule_cache
+from .const import (
+    DOMAIN,
+    CONF_ADDRESS_ID,
+    CONF_ADDRESS_NAME,
+    CONF_ADDRESSES,
+    CONF_ADDRESSES_CSV,
+    CONF_PARSE_CONCURRENCY,
+    _LOGGER,
+)
+from .service import get_coordinator, release_fetcher
+from .scheduler import MAX_CONCURRENT_PARSES, get_scheduler
+
+PLATFORMS = ["sensor", "binary_sensor", "calendar"]
+
+ADDRESS_SCHEMA = vol.Schema({
+    vol.Required(CONF_ADDRESS_NAME): cv.string,
+    vol.Required(CONF_ADDRESS_ID): cv.string,
+})
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema({
+            vol.Optional(CONF_ADDRESSES, default=[]): vol.All(cv.ensure_list, [ADDRESS_SCHEMA]),
+            vol.Optional(CONF_ADDRESSES_CSV): cv.string,
+            vol.Optional(CONF_PARSE_CONCURRENCY, default=MAX_CONCURRENT_PARSES): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=8)
+            ),
+        })
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the shared scheduler and import any addresses listed in configuration.yaml."""
+    if DOMAIN in config:
+        # Runs before any entry is set up, so this creates the scheduler they all share
+        get_scheduler(hass, max_concurrent_parses=config[DOMAIN][CONF_PARSE_CONCURRENCY])
+        # Validating hundreds of addresses takes a while under the rate limit
+        hass.async_create_background_task(
+            _async_import_from_config(hass, config[DOMAIN]), f"{DOMAIN} address import"
+        )
+    return True
+
+async def _async_import_from_config(hass: HomeAssistant, conf: dict) -> None:
+    addresses = list(conf[CONF_ADDRESSES])
+    if CONF_ADDRESSES_CSV in conf:
+        path = hass.config.path(conf[CONF_ADDRESSES_CSV])
+        try:
+            addresses += await hass.async_add_executor_job(read_addresses_csv, path)
+        except (OSError, UnicodeDecodeError) as ex:
+            _LOGGER.error("Could not read addresses from %s: %s", path, ex)
+    if addresses:
+        await async_import_addresses(hass, addresses)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Auckland Rubbish Collection from a config entry."""
@@ -11,14 +67,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if DOMAIN not in hass.data:
         hass.data[DOMAIN] = {}
 
+    # Load the persisted schedules before any coordinator looks at them
+    await get_schedule_cache(hass).async_load()
+
     # Get or create coordinator using the service module
     coordinator = get_coordinator(hass, entry)
     
     try:
-        await coordinator.async_config_entry_first_refresh()
-        await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "binary_sensor"])
+        fetched = coordinator.async_restore_from_cache()
+        if fetched is None:
+            await coordinator.async_config_entry_first_refresh()
+        elif coordinator.next_refresh <= dt_util.utcnow():
+            # Entities come up from the cache; refresh from the council site in the background
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{DOMAIN} refresh {entry.title}"
+            )
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     except Exception as ex:
         _LOGGER.exception("Error during setup: %s", ex)
+        # Unload never runs for an entry that failed setup, so undo get_coordinator here
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        get_scheduler(hass).async_unregister(entry.entry_id)
+        release_fetcher(hass, coordinator.address_id)
         raise ConfigEntryNotReady from ex
 
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -29,11 +99,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Unloading entry: %s", entry.title)
     
     # Unload the platform entities
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "binary_sensor"])
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     # Clean up the coordinator if unloaded successfully
     if unload_ok and entry.entry_id in hass.data[DOMAIN]:
-        del hass.data[DOMAIN][entry.entry_id]
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        get_scheduler(hass).async_unregister(entry.entry_id)
+        # The fetcher is shared with other entries for the address; closed with the last of them
+        release_fetcher(hass, coordinator.address_id)
         
     return unload_ok
 
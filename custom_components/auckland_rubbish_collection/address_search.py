@@ -0,0 +1,121 @@
+import aiohttp
+import asyncio
+from datetime import timedelta
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, DATA_ADDRESS_INDEX, _LOGGER
+from .service import BASE_URL
+
+# The address lookup behind the council's "find your collection day" search box
+SEARCH_PATH = "/_vti_bin/ACWeb/ACservices.svc/GetMatchingPropertyAddresses"
+SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=15)
+MAX_RESULTS = 10
+MIN_QUERY_LENGTH = 3
+SEARCH_TTL = timedelta(hours=12)
+
+def normalize(text: str) -> str:
+    """Lower case, without commas and repeated spaces, so typed queries and addresses compare."""
+    return " ".join(str(text).lower().replace(",", " ").split())
+
+def matches(query: str, key: str) -> bool:
+    """Whether a normalised address matches a query the way the council search does (word starts)."""
+    words = key.split()
+    return all(any(word.startswith(part) for word in words) for part in query.split())
+
+class AddressLookupError(Exception):
+    """The council address lookup could not be reached or returned something unexpected."""
+
+class AucklandRubbishAddressIndex:
+    """
+    Cache council address lookups so repeated and autocomplete-style searches
+    are answered locally.
+
+    Results are indexed by normalised query. A query is answered without asking
+    the council site if it was searched before, or if one of its prefixes was
+    searched and returned fewer than MAX_RESULTS: that result was complete, and
+    typing more can only narrow it, so it is filtered locally. Searches expire
+    after SEARCH_TTL.
+    """
+    def __init__(self, hass, ttl=SEARCH_TTL, session=None, base_url=BASE_URL):
+        self.hass = hass
+        self.ttl = ttl
+        self.session = session
+        self.base_url = base_url
+        # normalised query -> (expires, complete, [(address_id, address, key), ...])
+        self._queries = {}
+        self.lookups = 0
+        self.local_hits = 0
+
+    async def async_search(self, query: str) -> list[tuple[str, str]]:
+        """Return up to MAX_RESULTS (address_id, address) pairs for a partial address."""
+        query = normalize(query)
+        now = dt_util.utcnow()
+        self._evict(now)
+
+        results = self.search_local(query)
+        if results is not None:
+            self.local_hits += 1
+            return results
+
+        self.lookups += 1
+        found = await self._async_lookup(query)
+        self._queries[query] = (
+            now + self.ttl,
+            len(found) < MAX_RESULTS,
+            [(address_id, address, normalize(address)) for address_id, address in found],
+        )
+        return found
+
+    def search_local(self, query: str):
+        """Answer a normalised query from the index, or return None if it has to be looked up."""
+        if query in self._queries:
+            return [(address_id, address) for address_id, address, _ in self._queries[query][2]]
+
+        # Longest complete result for a prefix of the query
+        for length in range(len(query) - 1, MIN_QUERY_LENGTH - 1, -1):
+            cached = self._queries.get(query[:length])
+            if cached is not None and cached[1]:
+                return [
+                    (address_id, address)
+                    for address_id, address, key in cached[2]
+                    if matches(query, key)
+                ]
+        return None
+
+    def _evict(self, now):
+        expired = [query for query, (expires, _, _) in self._queries.items() if expires <= now]
+        for query in expired:
+            del self._queries[query]
+
+    async def _async_lookup(self, query):
+        session = self.session or async_get_clientsession(self.hass)
+        payload = {"ResultCount": str(MAX_RESULTS), "SearchText": query, "RateKeyRequired": "false"}
+        _LOGGER.debug("Looking up addresses matching '%s'", query)
+        try:
+            async with session.post(self.base_url + SEARCH_PATH, json=payload, timeout=SEARCH_TIMEOUT) as response:
+                response.raise_for_status()
+                found = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+            raise AddressLookupError(str(err) or type(err).__name__) from err
+
+        if not isinstance(found, list):
+            raise AddressLookupError(f"unexpected response: {str(found)[:100]}")
+        results = []
+        for match in found[:MAX_RESULTS]:
+            if not isinstance(match, dict):
+                continue
+            address_id = str(match.get("ACRateAccountKey") or "").strip()
+            address = str(match.get("Address") or "").strip()
+            if address_id and address:
+                results.append((address_id, address))
+        return results
+
+def get_address_index(hass) -> AucklandRubbishAddressIndex:
+    """Get or create the address search index shared by all config flows."""
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = {}
+
+    if DATA_ADDRESS_INDEX not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_ADDRESS_INDEX] = AucklandRubbishAddressIndex(hass)
+
+    return hass.data[DOMAIN][DATA_ADDRESS_INDEX]
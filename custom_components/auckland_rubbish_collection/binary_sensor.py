@@ -1,59 +1,46 @@
-import datetime
-from datetime import date
 from homeassistant.components.binary_sensor import BinarySensorEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .const import DOMAIN, _LOGGER
+from .const import CONF_SINGLE_ENTITY, _LOGGER
+from .entity import AucklandRubbishEntity
 from .service import get_coordinator
 
-def slugify(name: str) -> str:
-    """Convert a string into a slug safe for unique IDs."""
-    return name.lower().replace(" ", "_")
-
 async def async_setup_entry(hass, entry, async_add_entities):
-    """Set up the Collection Today binary sensor."""
+    """Set up the Collection Today and Collection Tomorrow binary sensors."""
     # Get the coordinator
     coordinator = get_coordinator(hass, entry)
-    async_add_entities([CollectionTodayBinarySensor(coordinator)])
+    if entry.options.get(CONF_SINGLE_ENTITY, False):
+        # Shown as attributes of the Schedule sensor instead
+        return
+    async_add_entities([
+        CollectionTodayBinarySensor(coordinator),
+        CollectionTomorrowBinarySensor(coordinator),
+    ])
 
-class CollectionTodayBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class CollectionTodayBinarySensor(AucklandRubbishEntity, BinarySensorEntity):
     """Binary sensor indicating whether there is a rubbish collection today."""
+    sensor_type = "collection_today"
+    days_ahead = 0
+
     def __init__(self, coordinator):
-        super().__init__(coordinator)
-        _LOGGER.debug("Adding Sensor: collection_today")
-        self.coordinator = coordinator
-        self._attr_name = f"{coordinator.address_name} Collection Today"
-        self._attr_unique_id = f"{DOMAIN}_{slugify(coordinator.address_name)}_collection_today"
+        _LOGGER.debug("Adding Sensor: %s", self.sensor_type)
+        self._attr_icon = "mdi:trash-can-outline"
+        super().__init__(coordinator, self.sensor_type, self.sensor_type.replace('_', ' ').title())
 
-    @property
-    def is_on(self):
-        """Return true if today is a collection day."""
-        if not self.coordinator.data:
-            _LOGGER.warning("Collection data is not yet available.")
-            return False
-        today = date.today()
-        for key in ("rubbish", "recycling", "food_scraps"):
-            raw = self.coordinator.data.get(key)
-            if raw:
-                try:
-                    if date.fromisoformat(raw) == today:
-                        return True
-                except ValueError:
-                    _LOGGER.warning("Invalid date format for %s: %s", key, raw)
-        return False
+    def _compute_values(self) -> tuple:
+        """Whether there is a collection days_ahead days from today."""
+        record = self.coordinator.data
+        return (
+            record is not None,
+            # days_until is rolled over at local midnight by the scheduler, no date maths needed here
+            record is not None and self.days_ahead in record.days_until.values(),
+            # Flag the state as coming from the last good schedule while fetching fails
+            {"stale": self.coordinator.stale},
+        )
 
-    @property
-    def device_info(self):
-        """Return device information for this integration."""
-        return {
-            "identifiers": {(DOMAIN, slugify(self.coordinator.address_name))},
-            "name": self.coordinator.address_name,
-            "manufacturer": "Auckland Council",
-            "model": "Rubbish Collection Service",
-            "entry_type": "service",  # This indicates it's a service, not a device
-        }
+    def _apply_values(self, values) -> None:
+        _, self._attr_is_on, self._attr_extra_state_attributes = values
 
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return "mdi:trash-can-outline"
+class CollectionTomorrowBinarySensor(CollectionTodayBinarySensor):
+    """Binary sensor indicating whether there is a rubbish collection tomorrow."""
+    sensor_type = "collection_tomorrow"
+    days_ahead = 1
 
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, DATA_BREAKER, _LOGGER
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = timedelta(minutes=10)
+MAX_RESET_TIMEOUT = timedelta(hours=2)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+class AucklandRubbishCircuitBreaker:
+    """
+    Stop sending requests to the council site while it keeps failing.
+
+    After FAILURE_THRESHOLD failed fetches in a row (for any address) the
+    breaker opens and fetches fail straight away. Once the reset timeout has
+    passed a single trial fetch is let through: success closes the breaker,
+    failure opens it again for twice as long, up to MAX_RESET_TIMEOUT.
+    """
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.trips = 0
+        self.open_until = None
+        self._timeout = reset_timeout
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.open_until is None:
+            return STATE_CLOSED
+        if self._trial or dt_util.utcnow() >= self.open_until:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    @callback
+    def async_allow(self) -> bool:
+        """Whether a fetch may go ahead now. While half open only one trial runs at a time."""
+        if self.open_until is None:
+            return True
+        if self._trial or dt_util.utcnow() < self.open_until:
+            return False
+        self._trial = True
+        return True
+
+    @callback
+    def async_record_success(self):
+        if self.open_until is not None:
+            _LOGGER.info("Council site is responding again, resuming fetches")
+        self.failures = 0
+        self.open_until = None
+        self._timeout = self.reset_timeout
+        self._trial = False
+
+    @callback
+    def async_record_failure(self):
+        self.failures += 1
+        if self._trial:
+            self._trial = False
+            self._timeout = min(self._timeout * 2, MAX_RESET_TIMEOUT)
+            self._async_open()
+        elif self.open_until is None and self.failures >= self.failure_threshold:
+            self._async_open()
+
+    @callback
+    def async_end_trial(self):
+        """
+        End a trial fetch that stopped without hearing from the council site
+        (cancelled, or failed for some other reason), so the next fetch can try.
+        """
+        self._trial = False
+
+    @callback
+    def _async_open(self):
+        self.trips += 1
+        self.open_until = dt_util.utcnow() + self._timeout
+        _LOGGER.warning(
+            "Council site failed %d fetches in a row, pausing requests until %s",
+            self.failures,
+            self.open_until,
+        )
+
+def get_circuit_breaker(hass) -> AucklandRubbishCircuitBreaker:
+    """Get or create the circuit breaker shared by all config entries."""
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = {}
+
+    if DATA_BREAKER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_BREAKER] = AucklandRubbishCircuitBreaker()
+
+    return hass.data[DOMAIN][DATA_BREAKER]
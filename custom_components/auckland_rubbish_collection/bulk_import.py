@@ -0,0 +1,146 @@
+import asyncio
+import csv
+import time
+from pathlib import Path
+from homeassistant.config_entries import SOURCE_IMPORT
+from .cache import get_schedule_cache
+from .const import DOMAIN, CONF_ADDRESS_ID, CONF_ADDRESS_NAME, _LOGGER
+from .parsing import UNKNOWN_ADDRESS
+from .service import AucklandRubbishAddressFetcher, ScheduleNotFound
+
+# Validation requests started per second; concurrency is capped by the scheduler as usual
+IMPORT_RATE = 2
+
+# Accepted titles for the address_id column, if the CSV file has a header row
+CSV_HEADERS = {CONF_ADDRESS_ID, "address id", "assessment number"}
+
+class RateLimiter:
+    """Space out callers so no more than rate of them go ahead each second."""
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self._next = 0.0
+
+    async def async_wait(self):
+        now = time.monotonic()
+        wait = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+def read_addresses_csv(path) -> list[dict]:
+    """
+    Read name,address_id rows from a CSV file (a header row is optional).
+    Does blocking I/O, so run it in the executor.
+    """
+    addresses = []
+    with Path(path).open(newline="", encoding="utf-8-sig") as csv_file:
+        for row in csv.reader(csv_file):
+            if not row or not "".join(row).strip() or row[0].lstrip().startswith("#"):
+                continue
+            if len(row) < 2:
+                addresses.append({CONF_ADDRESS_NAME: row[0].strip(), CONF_ADDRESS_ID: ""})
+                continue
+            name, address_id = row[0].strip(), row[1].strip()
+            if address_id.lower() in CSV_HEADERS:
+                continue
+            addresses.append({CONF_ADDRESS_NAME: name, CONF_ADDRESS_ID: address_id})
+    return addresses
+
+def configured_addresses(hass):
+    """Return the (names, address_ids) of the config entries already set up."""
+    names, address_ids = set(), set()
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        names.add(entry.data.get(CONF_ADDRESS_NAME, entry.title).lower())
+        address_ids.add(entry.options.get(CONF_ADDRESS_ID, entry.data.get(CONF_ADDRESS_ID)))
+    return names, address_ids
+
+async def async_validate_address(hass, address_id, limiter):
+    """
+    Fetch and parse one address, returning (data, None) if it has a collection
+    schedule or (None, reason) if not. The schedule is left in the disk cache,
+    so the entry created for it starts without fetching again.
+    """
+    await limiter.async_wait()
+    fetcher = AucklandRubbishAddressFetcher(hass, address_id)
+    try:
+        data, _ = await fetcher.async_fetch()
+    except ScheduleNotFound as err:
+        if err.geolocation_address in (None, UNKNOWN_ADDRESS):
+            return None, "is not known to the council site"
+        return None, "has no collection schedule"
+    except Exception as err:
+        return None, f"could not be fetched ({err or type(err).__name__})"
+    if not data or data.get("geolocation_address") in (None, UNKNOWN_ADDRESS):
+        return None, "is not known to the council site"
+    if not data.get("rubbish") and not data.get("recycling"):
+        return None, "has no collection schedule"
+    return data, None
+
+async def async_import_addresses(hass, addresses):
+    """
+    Validate a batch of {address_name, address_id} dicts against the council site
+    and create a config entry for each valid one.
+
+    Rows with a badly formed ID, or a name or ID used earlier in the batch, are
+    rejected without fetching; addresses that are already configured are skipped.
+    Returns {"imported": [...], "skipped": [...], "rejected": [(row, reason), ...]}.
+    """
+    # Validation writes each schedule to the cache, so it has to be loaded first
+    await get_schedule_cache(hass).async_load()
+    names, address_ids = configured_addresses(hass)
+    results = {"imported": [], "skipped": [], "rejected": []}
+    batch_names, batch_ids, pending = set(), set(), []
+
+    for row in addresses:
+        name, address_id = str(row[CONF_ADDRESS_NAME]).strip(), str(row[CONF_ADDRESS_ID]).strip()
+        row = {CONF_ADDRESS_NAME: name, CONF_ADDRESS_ID: address_id}
+        if address_id in address_ids:
+            results["skipped"].append(row)
+        elif not name:
+            results["rejected"].append((row, "has no name"))
+        elif len(address_id) != 11 or not address_id.isdigit():
+            results["rejected"].append((row, "is not an 11-digit Assessment Number"))
+        elif address_id in batch_ids:
+            results["rejected"].append((row, "appears more than once"))
+        elif name.lower() in names or name.lower() in batch_names:
+            # Entity IDs are derived from the name, so it has to be unique too
+            results["rejected"].append((row, "uses a name that is already taken"))
+        else:
+            batch_names.add(name.lower())
+            batch_ids.add(address_id)
+            pending.append(row)
+
+    limiter = RateLimiter(IMPORT_RATE)
+    validated = await asyncio.gather(*(
+        async_validate_address(hass, row[CONF_ADDRESS_ID], limiter) for row in pending
+    ))
+
+    for row, (data, reason) in zip(pending, validated):
+        if reason:
+            results["rejected"].append((row, reason))
+            continue
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_IMPORT}, data=row
+        )
+        if result.get("type") == "create_entry":
+            _LOGGER.info(
+                "Imported %s (%s): %s",
+                row[CONF_ADDRESS_NAME],
+                row[CONF_ADDRESS_ID],
+                data["geolocation_address"],
+            )
+            results["imported"].append(row)
+        else:
+            results["skipped"].append(row)
+
+    for row, reason in results["rejected"]:
+        _LOGGER.warning(
+            "Not importing %s (%s): it %s", row[CONF_ADDRESS_NAME], row[CONF_ADDRESS_ID] or "no ID", reason
+        )
+    _LOGGER.info(
+        "Address import finished: %d imported, %d already configured, %d rejected",
+        len(results["imported"]),
+        len(results["skipped"]),
+        len(results["rejected"]),
+    )
+    return results
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, DATA_CACHE, MAX_CACHE_MAX_AGE, _LOGGER
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.schedule_cache"
+SAVE_DELAY = 30  # seconds
+
+class AucklandRubbishScheduleCache:
+    """
+    Persist the last parsed schedule for each address_id across restarts.
+
+    Stored as {"entries": {address_id: {"fetched": <ISO timestamp>, "data": {...}}}}
+    so entities can be restored without waiting for the council site.
+    """
+    def __init__(self, hass):
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._entries = {}
+        self._load_task = None
+
+    async def async_load(self):
+        """Load the cache from disk (only once, however many entries ask)."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self):
+        stored = await self._store.async_load() or {}
+        self._entries = stored.get("entries", {})
+        # Drop anything older than the largest age any entry may be configured with
+        expired = [
+            address_id for address_id in self._entries
+            if self._age(address_id) > timedelta(days=MAX_CACHE_MAX_AGE)
+        ]
+        for address_id in expired:
+            del self._entries[address_id]
+        if expired:
+            self._async_schedule_save()
+        _LOGGER.debug("Loaded %d cached schedule(s), evicted %d", len(self._entries), len(expired))
+
+    def _age(self, address_id) -> timedelta:
+        fetched = dt_util.parse_datetime(self._entries[address_id].get("fetched", ""))
+        if fetched is None:
+            return timedelta.max
+        return dt_util.utcnow() - fetched
+
+    @callback
+    def async_get(self, address_id, max_age: timedelta):
+        """Return (data, fetched) for this address, or None if missing or stale."""
+        if address_id not in self._entries:
+            return None
+        if self._age(address_id) > max_age:
+            _LOGGER.debug("Evicting stale cached schedule for %s", address_id)
+            del self._entries[address_id]
+            self._async_schedule_save()
+            return None
+        cached = self._entries[address_id]
+        return cached["data"], dt_util.parse_datetime(cached["fetched"])
+
+    @callback
+    def async_set(self, address_id, data):
+        """Store the latest parsed schedule for this address."""
+        self._entries[address_id] = {
+            "fetched": dt_util.utcnow().isoformat(),
+            "data": data,
+        }
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self):
+        self._store.async_delay_save(lambda: {"entries": self._entries}, SAVE_DELAY)
+
+def get_schedule_cache(hass) -> AucklandRubbishScheduleCache:
+    """Get or create the schedule cache shared by all config entries."""
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = {}
+
+    if DATA_CACHE not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_CACHE] = AucklandRubbishScheduleCache(hass)
+
+    return hass.data[DOMAIN][DATA_CACHE]
@@ -0,0 +1,92 @@
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.util import dt as dt_util
+from .const import _LOGGER
+from .entity import AucklandRubbishEntity
+from .service import get_coordinator
+
+# How often each collection comes round, in days, and how far ahead to project them
+COLLECTION_INTERVALS = {
+    "rubbish": 7,
+    "recycling": 14,
+    "food_scraps": 7,
+}
+COLLECTION_SUMMARIES = {
+    "rubbish": "Rubbish",
+    "recycling": "Recycling",
+    "food_scraps": "Food scraps",
+}
+PROJECTION_WEEKS = 12
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up the collection calendar."""
+    coordinator = get_coordinator(hass, entry)
+    async_add_entities([RubbishCollectionCalendar(coordinator)])
+
+class CollectionEventIndex:
+    """
+    Upcoming collections projected from the next date of each type, kept as
+    parallel arrays sorted by date so range queries are two bisections.
+    """
+    def __init__(self, dates, weeks=PROJECTION_WEEKS):
+        self.source = dict(dates)
+        events = []
+        for key in COLLECTION_INTERVALS:
+            first = self.source.get(key)
+            if not first:
+                continue
+            interval = timedelta(days=COLLECTION_INTERVALS[key])
+            day = first
+            while day < first + timedelta(weeks=weeks):
+                events.append((day, key))
+                day += interval
+        # Stable, so same-day collections stay in COLLECTION_INTERVALS order
+        events.sort(key=lambda event: event[0])
+        self.days = [day for day, _ in events]
+        self.events = [
+            CalendarEvent(start=day, end=day + timedelta(days=1), summary=COLLECTION_SUMMARIES[key])
+            for day, key in events
+        ]
+
+    def between(self, start_day, end_day):
+        """Events from start_day up to and including end_day."""
+        return self.events[bisect_left(self.days, start_day):bisect_right(self.days, end_day)]
+
+    def next_from(self, day):
+        """The first event on or after day, or None."""
+        index = bisect_left(self.days, day)
+        return self.events[index] if index < len(self.events) else None
+
+class RubbishCollectionCalendar(AucklandRubbishEntity, CalendarEntity):
+    """Upcoming collections for an address, as all-day calendar events."""
+    def __init__(self, coordinator):
+        _LOGGER.debug("Adding Calendar for: %s", coordinator.address_name)
+        self._attr_icon = "mdi:calendar-refresh"
+        self._index = CollectionEventIndex({})
+        super().__init__(coordinator, "calendar", "Collections")
+
+    @property
+    def event(self):
+        """The next collection (today's, until midnight)."""
+        return self._values[1]
+
+    def _compute_values(self) -> tuple:
+        record = self.coordinator.data
+        if record is not None and record.dates != self._index.source:
+            # Only rebuilt when the council dates change, not on every refresh or at midnight
+            self._index = CollectionEventIndex(record.dates)
+        today = record.as_of if record is not None else dt_util.now().date()
+        event = self._index.next_from(today)
+        # The calendar is on during a collection day, so that counts as a change too
+        return (record is not None, event, event is not None and event.start == today)
+
+    async def async_get_events(self, hass, start_date, end_date):
+        """Return the projected collections overlapping start_date to end_date."""
+        start_day = dt_util.as_local(start_date).date()
+        end_day = dt_util.as_local(end_date).date()
+        # An all-day event covers its whole local day; the range end is exclusive
+        return [
+            event for event in self._index.between(start_day, end_day)
+            if dt_util.start_of_local_day(event.start) < end_date
+        ]
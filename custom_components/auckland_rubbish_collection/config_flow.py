@@ -1,18 +1,69 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import DOMAIN, _LOGGER
+from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
+from .address_search import MIN_QUERY_LENGTH, AddressLookupError, get_address_index
+from .const import (
+    DOMAIN,
+    CONF_ADDRESS_ID,
+    CONF_ADDRESS_NAME,
+    CONF_CACHE_MAX_AGE,
+    CONF_SINGLE_ENTITY,
+    DEFAULT_CACHE_MAX_AGE,
+    MAX_CACHE_MAX_AGE,
+    _LOGGER,
+)
 
-CONF_ADDRESS_NAME = "address_name"
-CONF_ADDRESS_ID = "address_id"
+CONF_QUERY = "query"
 
 class AucklandRubbishConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Auckland Council Rubbish Collection."""
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
+    def __init__(self):
+        self._matches = []
+
     async def async_step_user(self, user_input=None):
-        """Handle the initial step."""
+        """Handle the initial step: search for the address, or enter its Assessment Number."""
+        return self.async_show_menu(step_id="user", menu_options=["search", "manual"])
+
+    async def async_step_search(self, user_input=None):
+        """Search the council's address lookup for the address."""
+        errors = {}
+        if user_input is not None:
+            query = user_input[CONF_QUERY].strip()
+            if len(query) < MIN_QUERY_LENGTH:
+                errors[CONF_QUERY] = "query_too_short"
+            else:
+                try:
+                    self._matches = await get_address_index(self.hass).async_search(query)
+                except AddressLookupError as ex:
+                    _LOGGER.warning("Address lookup failed: %s", ex)
+                    errors["base"] = "cannot_connect"
+                else:
+                    if self._matches:
+                        return await self.async_step_select()
+                    errors[CONF_QUERY] = "no_results"
+        return self.async_show_form(
+            step_id="search",
+            data_schema=vol.Schema({vol.Required(CONF_QUERY): str}),
+            errors=errors,
+        )
+
+    async def async_step_select(self, user_input=None):
+        """Pick one of the addresses found, and name it."""
+        if user_input is not None:
+            return await self.async_step_manual(user_input)
+        options = [{"value": address_id, "label": address} for address_id, address in self._matches]
+        data_schema = vol.Schema({
+            vol.Required(CONF_ADDRESS_ID): SelectSelector(SelectSelectorConfig(options=options)),
+            vol.Required(CONF_ADDRESS_NAME): str,
+        })
+        return self.async_show_form(step_id="select", data_schema=data_schema)
+
+    async def async_step_manual(self, user_input=None):
+        """Enter the Assessment Number found on the council website."""
         errors = {}
         if user_input is not None:
             _LOGGER.debug("User input received: %s", user_input)
@@ -33,12 +84,20 @@ class AucklandRubbishConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             "url": "https://www.aucklandcouncil.govt.nz/en/rubbish-recycling/rubbish-recycling-collections/rubbish-recycling-collection-days.html"
         }
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=data_schema,
             errors=errors,
             description_placeholders=description_placeholders,
         )
 
+    async def async_step_import(self, import_data):
+        """Create an entry for an address imported from configuration.yaml (validated by bulk_import)."""
+        address_id = import_data[CONF_ADDRESS_ID]
+        for entry in self._async_current_entries():
+            if entry.options.get(CONF_ADDRESS_ID, entry.data.get(CONF_ADDRESS_ID)) == address_id:
+                return self.async_abort(reason="already_configured")
+        return self.async_create_entry(title=import_data[CONF_ADDRESS_NAME], data=import_data)
+
     @staticmethod
     @callback
     def async_get_options_flow(entry):
@@ -64,6 +123,10 @@ class AucklandRubbishOptionsFlow(config_entries.OptionsFlow):
                 return self.async_create_entry(data=user_input)
         options_schema = vol.Schema({
             vol.Required(CONF_ADDRESS_ID, default=self.entry.options.get(CONF_ADDRESS_ID, self.entry.data.get(CONF_ADDRESS_ID, ""))): str,
+            vol.Optional(CONF_CACHE_MAX_AGE, default=self.entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE)): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_CACHE_MAX_AGE)
+            ),
+            vol.Optional(CONF_SINGLE_ENTITY, default=self.entry.options.get(CONF_SINGLE_ENTITY, False)): bool,
         })
         description_placeholders = {
             "url": "https://www.aucklandcouncil.govt.nz/en/rubbish-recycling/rubbish-recycling-collections/rubbish-recycling-collection-days.html"
@@ -2,3 +2,26 @@ import logging
 
 DOMAIN = "auckland_rubbish_collection"
 _LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Keys for shared (non config entry) objects stored under hass.data[DOMAIN]
+DATA_SCHEDULER = "scheduler"
+DATA_CACHE = "cache"
+DATA_FETCHERS = "fetchers"
+DATA_BREAKER = "breaker"
+DATA_ADDRESS_INDEX = "address_index"
+
+# Config entry data
+CONF_ADDRESS_NAME = "address_name"
+CONF_ADDRESS_ID = "address_id"
+
+# configuration.yaml, for importing addresses in bulk
+CONF_ADDRESSES = "addresses"
+CONF_ADDRESSES_CSV = "addresses_csv"
+# configuration.yaml, for tuning large installs
+CONF_PARSE_CONCURRENCY = "parse_concurrency"
+
+# Options
+CONF_CACHE_MAX_AGE = "cache_max_age"
+DEFAULT_CACHE_MAX_AGE = 7  # days
+MAX_CACHE_MAX_AGE = 30  # days
+CONF_SINGLE_ENTITY = "single_entity"
@@ -0,0 +1,40 @@
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN, CONF_ADDRESS_ID
+
+# The address ID identifies the property as surely as its street address does
+TO_REDACT = {"geolocation_address", CONF_ADDRESS_ID}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry, including timings for its recent refreshes."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    fetcher = coordinator.fetcher
+    record = coordinator.data
+
+    return async_redact_data({
+        "address_id": coordinator.address_id,
+        "options": dict(entry.options),
+        "schedule": record.as_data() if record else None,
+        "stale": coordinator.stale,
+        "last_update_success": coordinator.last_update_success,
+        "next_refresh": coordinator.next_refresh.isoformat() if coordinator.next_refresh else None,
+        "fetcher": {
+            "entries": fetcher.refs,
+            "fetched": fetcher.fetched.isoformat() if fetcher.fetched else None,
+            "requests": fetcher.requests,
+            "retries": fetcher.retries,
+            "failures": fetcher.failures,
+            "mean_latency_ms": fetcher.mean_latency,
+            "conditional_hits": fetcher.conditional_hits,
+            "conditional_misses": fetcher.conditional_misses,
+            "circuit_breaker": fetcher.breaker.state,
+        },
+        "refreshes": [redact_address_id(stats.as_dict(), coordinator.address_id) for stats in coordinator.stats],
+    }, TO_REDACT)
+
+def redact_address_id(refresh: dict, address_id: str) -> dict:
+    """Blank the address ID out of a refresh's error, which may quote the page URL."""
+    if refresh.get("error"):
+        refresh["error"] = refresh["error"].replace(address_id, REDACTED)
+    return refresh
@@ -0,0 +1,63 @@
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN
+
+def slugify(name: str) -> str:
+    """Convert a string into a slug safe for unique IDs."""
+    return name.lower().replace(" ", "_")
+
+class AucklandRubbishEntity(CoordinatorEntity):
+    """
+    Base for the entities of an address, grouped under one service device.
+
+    Subclasses work out what they show in _compute_values, as a tuple starting
+    with whether the entity is available; state is only written when it changes.
+    """
+    def __init__(self, coordinator, key, name):
+        super().__init__(coordinator)
+        # Use slugified address_name for unique IDs
+        self._attr_name = f"{coordinator.address_name} {name}"
+        self._attr_unique_id = f"{DOMAIN}_{slugify(coordinator.address_name)}_{key}"
+        # Fixed for the life of the entity, so built once rather than on every state write
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, slugify(coordinator.address_name))},
+            "name": coordinator.address_name,
+            "manufacturer": "Auckland Council",
+            "model": "Rubbish Collection Service",
+            "entry_type": "service",  # This indicates it's a service, not a device
+        }
+        self._values = None
+        self._async_update_attrs()
+
+    @property
+    def available(self) -> bool:
+        """Stay available with the last good schedule while the council site can't be reached."""
+        return self._values[0]
+
+    async def async_added_to_hass(self) -> None:
+        """Catch up with any refresh that finished after __init__ but before the listener was added."""
+        await super().async_added_to_hass()
+        self._async_update_attrs()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when something this entity shows has changed."""
+        if self._async_update_attrs():
+            self.async_write_ha_state()
+
+    @callback
+    def _async_update_attrs(self) -> bool:
+        """Work out this entity's values from the coordinator; returns whether any changed."""
+        values = self._compute_values()
+        if values == self._values:
+            return False
+        self._values = values
+        self._apply_values(values)
+        return True
+
+    def _compute_values(self) -> tuple:
+        """What the entity shows, starting with whether it is available."""
+        raise NotImplementedError
+
+    def _apply_values(self, values) -> None:
+        """Copy freshly computed values onto the entity's attributes."""
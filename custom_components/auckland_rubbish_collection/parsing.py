@@ -0,0 +1,417 @@
+import hashlib
+import re
+import time
+from datetime import date
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING
+from .const import _LOGGER
+
+# BeautifulSoup and dateutil are only needed when the fast paths (the streaming
+# extractor and the regex date parser) fail, so they are imported on first use.
+# That saves loading bs4 at startup; dateutil is loaded by Home Assistant anyway.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+SCHEDULE_CARD_CLASS = "acpl-schedule-card"
+SCHEDULE_ENTRY_CLASSES = {"mb-0", "lead"}
+UNKNOWN_ADDRESS = "Unknown address"
+
+def format_address(street, suburb, heading) -> str:
+    """Combine the parts of the address <h2> the same way regardless of engine."""
+    if street and suburb:
+        return f"{street}, {suburb}"
+    elif street:
+        return street
+    elif suburb:
+        return suburb
+    else:
+        return heading
+
+class ScheduleBoundary:
+    """
+    Spot, in the raw response bytes, where the element holding the schedule cards closes.
+
+    Counting starts at the first <div> start tag whose class attribute includes
+    SCHEDULE_CARD_CLASS (so the name turning up in a script, style or comment
+    doesn't count), and only <div> tags are counted from there, so it is cheap
+    enough to run on the event loop after every chunk received. If the block
+    turns out to hold no schedule entry, the boundary gives up and the whole
+    page is read, so the full parse fallback gets to see all of it.
+    """
+    _CARD_TAG = re.compile(
+        rb"<div\b[^>]*?\bclass\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))[^>]*>", re.IGNORECASE
+    )
+    _ENTRY_TAG = re.compile(
+        rb"<p\b[^>]*?\bclass\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))", re.IGNORECASE
+    )
+    _DIV_TAG = re.compile(rb"<(/?)div[\s>/]", re.IGNORECASE)
+    _CARD_CLASS = SCHEDULE_CARD_CLASS.encode()
+    _ENTRY_CLASSES = {name.encode() for name in SCHEDULE_ENTRY_CLASSES}
+
+    def __init__(self):
+        self.done = False
+        self.gave_up = False
+        self._pos = 0
+        self._start = None
+        self._depth = None
+
+    @staticmethod
+    def _classes(match):
+        return next(value for value in match.groups() if value is not None).lower().split()
+
+    def scan(self, body) -> bool:
+        """Scan the body received so far, returning True once the schedule block has closed."""
+        if self.done or self.gave_up:
+            return self.done
+        if self._depth is None:
+            for match in self._CARD_TAG.finditer(body, self._pos):
+                if self._CARD_CLASS in self._classes(match):
+                    # Start counting from the opening tag of the first card
+                    self._start = self._pos = match.start()
+                    self._depth = 0
+                    break
+            else:
+                # Resume from a tag that may be split across chunks
+                last = body.rfind(b"<", self._pos)
+                self._pos = last if last != -1 and body.find(b">", last) == -1 else len(body)
+                return False
+        for match in self._DIV_TAG.finditer(body, self._pos):
+            self._depth += -1 if match.group(1) else 1
+            self._pos = match.end()
+            if self._depth < 0:
+                if not any(
+                    self._ENTRY_CLASSES <= set(self._classes(entry))
+                    for entry in self._ENTRY_TAG.finditer(body, self._start, self._pos)
+                ):
+                    _LOGGER.debug("No schedule entries found before the schedule block closed, reading the whole page")
+                    self.gave_up = True
+                    return False
+                self.done = True
+                return True
+        # Leave room to re-scan a tag split across chunks
+        self._pos = max(self._pos, len(body) - 6)
+        return False
+
+class StreamingScheduleExtractor(HTMLParser):
+    """
+    Incrementally pull the address heading and schedule card entries out of a page.
+
+    Nothing else is kept, and once the element containing the schedule cards
+    closes `done` is set so the caller can stop reading the response.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.done = False
+        self.entries = []
+        self._div_depth = 0
+        self._block_depth = None
+        self._card_depth = None
+        self._entry = None
+        self._h2 = None
+        self._span = None
+        self._heading_span = []
+        self._heading = []
+        self._street = None
+        self._suburb = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        self._flush_text()
+        classes = set((dict(attrs).get("class") or "").split())
+        if tag == "div":
+            self._div_depth += 1
+            if SCHEDULE_CARD_CLASS in classes and self._card_depth is None:
+                self._card_depth = self._div_depth
+                if self._block_depth is None:
+                    self._block_depth = self._div_depth - 1
+        elif tag == "h2" and self._h2 is None and not self._heading:
+            self._h2 = []
+        elif tag == "span" and self._h2 is not None:
+            if "heading" in classes and self._street is None:
+                self._span = "street"
+            elif "subheading" in classes and self._suburb is None:
+                self._span = "suburb"
+            if self._span:
+                self._heading_span = []
+        elif tag == "p" and self._card_depth is not None and SCHEDULE_ENTRY_CLASSES <= classes:
+            self._entry = []
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        self._flush_text()
+        if tag == "div":
+            if self._div_depth == self._card_depth:
+                self._card_depth = None
+            elif self._block_depth is not None and self._div_depth == self._block_depth:
+                # The element holding the schedule cards has closed
+                self.done = True
+            self._div_depth -= 1
+        elif tag == "h2" and self._h2 is not None:
+            self._heading = self._h2 or [""]
+            self._h2 = None
+        elif tag == "span" and self._span:
+            setattr(self, f"_{self._span}", "".join(self._heading_span))
+            self._span = None
+        elif tag == "p" and self._entry is not None:
+            self.entries.append("".join(self._entry))
+            self._entry = None
+
+    def handle_data(self, data):
+        # A text node can arrive in pieces when it spans two fed chunks
+        if not self.done and (self._h2 is not None or self._entry is not None):
+            self._text.append(data)
+
+    def _flush_text(self):
+        # Mirror BeautifulSoup's get_text(strip=True): strip each string, join without a separator
+        text = "".join(self._text).strip()
+        self._text.clear()
+        if not text:
+            return
+        if self._h2 is not None:
+            self._h2.append(text)
+            if self._span:
+                self._heading_span.append(text)
+        if self._entry is not None:
+            self._entry.append(text)
+
+    def result(self):
+        """Return (address, entries) found so far."""
+        if not self._heading:
+            return UNKNOWN_ADDRESS, self.entries
+        return format_address(self._street, self._suburb, "".join(self._heading)), self.entries
+
+class SoupScheduleExtractor:
+    """Buffer the whole page and extract the schedule from a full BeautifulSoup tree."""
+    def __init__(self):
+        self.done = False
+        self._chunks = []
+
+    def feed(self, chunk):
+        self._chunks.append(chunk)
+
+    def close(self):
+        pass
+
+    def result(self):
+        """Return (address, entries)."""
+        return extract_schedule_soup("".join(self._chunks))
+
+def extract_schedule_soup(html: str):
+    """Extract (address, entries) from a complete page using BeautifulSoup."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    return parse_collection_address(soup), [
+        entry.get_text(strip=True)
+        for card in soup.find_all("div", class_=SCHEDULE_CARD_CLASS)
+        for entry in card.find_all("p", class_="mb-0 lead")
+    ]
+
+def parse_collection_address(soup: "BeautifulSoup") -> str:
+    """
+    Extracts the full address block from the HTML text.
+    Returns a string like '100A My Street, Auckland, Auckland 1001'.
+    """
+    address_block = soup.find("h2")
+    if not address_block:
+        return UNKNOWN_ADDRESS
+
+    street = address_block.find("span", class_="heading")
+    suburb = address_block.find("span", class_="subheading")
+    return format_address(
+        street.get_text(strip=True) if street else None,
+        suburb.get_text(strip=True) if suburb else None,
+        address_block.get_text(strip=True),
+    )
+
+# Available engines for pulling the schedule out of a council page
+EXTRACTION_ENGINES = {
+    "stream": StreamingScheduleExtractor,
+    "soup": SoupScheduleExtractor,
+}
+DEFAULT_EXTRACTION_ENGINE = "stream"
+FEED_SIZE = 16 * 1024
+
+MONTH_NAMES = ("january", "february", "march", "april", "may", "june", "july",
+               "august", "september", "october", "november", "december")
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Lookup tables for the fast date parser, accepting full and abbreviated names
+MONTHS = {name: number for number, name in enumerate(MONTH_NAMES, start=1)}
+MONTHS.update({name[:3]: number for name, number in list(MONTHS.items())})
+MONTHS["sept"] = 9
+WEEKDAYS = {name: number for number, name in enumerate(WEEKDAY_NAMES)}
+WEEKDAYS.update({name[:3]: number for name, number in list(WEEKDAYS.items())})
+COLLECTION_DATE_RE = re.compile(
+    r"^(?:(?P<weekday>[a-z]+)\.?,?\s+)?(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+"
+    r"(?P<month>[a-z]+)\.?(?:,?\s+(?P<year>\d{4}))?$"
+)
+
+@lru_cache(maxsize=256)
+def match_collection_date(text: str):
+    """
+    Split collection text like 'Thursday, 13 March' into (day, month, weekday, year).
+    weekday and year are None when not given; returns None if the text doesn't fit.
+    Memoised on the raw text since the same few strings repeat across every address.
+    """
+    match = COLLECTION_DATE_RE.match(text.strip().lower())
+    if not match or match["month"] not in MONTHS:
+        return None
+    weekday = None
+    if match["weekday"]:
+        if match["weekday"] not in WEEKDAYS:
+            return None
+        weekday = WEEKDAYS[match["weekday"]]
+    return int(match["day"]), MONTHS[match["month"]], weekday, int(match["year"]) if match["year"] else None
+
+def resolve_collection_date(day, month, weekday, year, today: date) -> date | None:
+    """
+    Pick the year for a day and month without one: whichever of last, this or
+    next year lands closest to today, and agrees with the weekday if one was given.
+    This covers the December to January rollover, and catches wrong-year
+    guesses at any other time of year too. Returns None if no year fits.
+    """
+    best = None
+    for candidate_year in (year,) if year else (today.year, today.year + 1, today.year - 1):
+        try:
+            candidate = date(candidate_year, month, day)
+        except ValueError:
+            continue
+        if weekday is not None and candidate.weekday() != weekday:
+            continue
+        if best is None or abs(candidate - today) < abs(best - today):
+            best = candidate
+    return best
+
+def parse_collection_date(text: str, today: date) -> str | None:
+    """Convert collection text (e.g., 'Thursday, 13 March') into ISO 8601 format ('YYYY-MM-DD')"""
+    matched = match_collection_date(text)
+    if matched:
+        resolved = resolve_collection_date(*matched, today)
+        if resolved:
+            return resolved.isoformat()
+        _LOGGER.debug("No nearby year puts '%s' on the given weekday, falling back to dateutil", text)
+
+    return parse_collection_date_dateutil(text, today)
+
+def parse_collection_date_dateutil(text: str, today: date) -> str | None:
+    """Fallback parser for collection text the fast path doesn't recognise."""
+    from dateutil import parser
+
+    try:
+        parsed = parser.parse(text, dayfirst=True)
+        # Year rollover fix:
+        # If today is December and the parsed month is January,
+        # assume the date refers to next year.
+        if today.month == 12 and parsed.month == 1:
+            _LOGGER.debug(
+                "Year rollover detected for '%s': parsed month=January while today is in December. "
+                "Adjusting year from %s to %s.",
+                text,
+                parsed.year,
+                parsed.year + 1,
+            )
+            parsed = parsed.replace(year=today.year + 1)
+
+        return parsed.date().isoformat()
+    except Exception:
+        return None
+
+def schedule_digest(address, entries) -> str:
+    """Digest the extracted schedule, so changes elsewhere on the page don't count."""
+    return hashlib.sha256("\n".join([address, *entries]).encode()).hexdigest()
+
+def parse_schedule(geolocation_address, collection_info, today: date, timings=None) -> dict:
+    """
+    Turn the extracted address and schedule entries into the coordinator data dict.
+    If a timings dict is given, the seconds spent parsing dates are stored in it.
+    """
+    # Initialize collection dates
+    rubbish, recycling, food_scraps = None, None, None
+    start = time.perf_counter()
+
+    if not collection_info:
+        _LOGGER.error("Unexpected response format: no collection data found")
+
+    # Parse each collection entry and assign to the correct type based on keywords
+    for text in collection_info:
+        if "rubbish" in text.lower():
+            raw_date = text.split(":", 1)[-1].strip() if ":" in text else text
+            rubbish = parse_collection_date(raw_date, today)
+        elif "recycling" in text.lower():
+            raw_date = text.split(":", 1)[-1].strip() if ":" in text else text
+            recycling = parse_collection_date(raw_date, today)
+        elif "food scraps" in text.lower():
+            raw_date = text.split(":", 1)[-1].strip() if ":" in text else text
+            food_scraps = parse_collection_date(raw_date, today)
+    if timings is not None:
+        timings["date_parse"] = time.perf_counter() - start
+
+    # Determine next collection type
+    try:
+        if rubbish and recycling:
+            if rubbish == recycling:
+                next_collection_type = "Rubbish & Recycling"
+            else:
+                next_collection_type = "Rubbish"
+        elif rubbish:
+                next_collection_type = "Rubbish"
+        else:
+            next_collection_type = None
+    except Exception:
+        next_collection_type = None
+
+    return {
+        "rubbish": rubbish,
+        "recycling": recycling,
+        "food_scraps": food_scraps,
+        "geolocation_address": geolocation_address,
+        "next_collection_type": next_collection_type
+    }
+
+def parse_schedule_page(body: bytes, charset, today: date, engine=DEFAULT_EXTRACTION_ENGINE,
+                        previous_digest=None, timings=None):
+    """
+    The CPU-bound parse stage, kept free of Home Assistant state so it can run
+    in an executor thread.
+
+    Returns (digest, data); data is None when the extracted schedule matches
+    previous_digest, so unchanged pages skip date parsing entirely.
+    """
+    start = time.perf_counter()
+    html = body.decode(charset or "utf-8", errors="replace")
+    extractor = EXTRACTION_ENGINES[engine]()
+    for offset in range(0, len(html), FEED_SIZE):
+        extractor.feed(html[offset:offset + FEED_SIZE])
+        if extractor.done:
+            break
+    else:
+        extractor.close()
+
+    address, entries = extractor.result()
+    if not entries and engine != "soup":
+        _LOGGER.debug("No schedule found by the '%s' engine, falling back to a full parse", engine)
+        address, entries = extract_schedule_soup(html)
+
+    digest = schedule_digest(address, entries)
+    if digest == previous_digest:
+        data = None
+    else:
+        data = parse_schedule(address, entries, today, timings)
+    if timings is not None:
+        timings["parse"] = time.perf_counter() - start
+    return digest, data
+
+def parse_schedule_page_timed(body: bytes, charset, today: date, engine=DEFAULT_EXTRACTION_ENGINE,
+                              previous_digest=None):
+    """
+    parse_schedule_page, also returning its timings (in seconds) as a third value,
+    so they come back with the result of the executor job.
+    """
+    timings = {}
+    digest, data = parse_schedule_page(body, charset, today, engine, previous_digest, timings)
+    return digest, data, timings
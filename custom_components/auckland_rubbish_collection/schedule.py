@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from datetime import date
+
+COLLECTION_KEYS = ("rubbish", "recycling", "food_scraps")
+
+# Which collection's date is the "next collection" date for each next_collection_type
+NEXT_COLLECTION_KEYS = {
+    "Rubbish": "rubbish",
+    "Rubbish & Recycling": "recycling",
+    "Recycling": "recycling",
+}
+
+def next_collection(dates, today: date):
+    """
+    The (next_collection_type, date) of the earliest rubbish or recycling
+    collection today or later, named the way the parser names it.
+    """
+    upcoming = {key: dates.get(key) for key in ("rubbish", "recycling")}
+    upcoming = {key: value for key, value in upcoming.items() if value and value >= today}
+    if not upcoming:
+        return None, None
+    first = min(upcoming.values())
+    if upcoming.get("rubbish") == first:
+        return ("Rubbish & Recycling" if upcoming.get("recycling") == first else "Rubbish"), first
+    return "Recycling", first
+
+@dataclass(frozen=True, slots=True)
+class ScheduleRecord:
+    """
+    The parsed schedule for one address, built once per refresh with everything
+    the entities show already worked out, so state writes don't re-parse dates.
+    Dicts are keyed by collection type (see COLLECTION_KEYS).
+    """
+    dates: dict
+    iso_dates: dict
+    weekdays: dict
+    days_until: dict
+    geolocation_address: str | None
+    next_collection_type: str | None
+    next_collection_date: date | None
+    next_collection_day: str | None
+    days_until_next: int | None
+    as_of: date
+
+    @classmethod
+    def build(cls, dates, geolocation_address, next_collection_type, today: date):
+        """Create a record from parsed collection dates, relative to today."""
+        next_key = NEXT_COLLECTION_KEYS.get(next_collection_type)
+        next_date = dates.get(next_key) if next_key else None
+        if next_date is not None and next_date < today:
+            # That collection has been (the day rolled over since it was parsed)
+            next_collection_type, next_date = next_collection(dates, today)
+        days_until = {key: (value - today).days if value else None for key, value in dates.items()}
+        upcoming = [days for days in days_until.values() if days is not None and days >= 0]
+        return cls(
+            dates=dates,
+            iso_dates={key: value.isoformat() if value else None for key, value in dates.items()},
+            weekdays={key: value.strftime("%A") if value else None for key, value in dates.items()},
+            days_until=days_until,
+            geolocation_address=geolocation_address,
+            next_collection_type=next_collection_type,
+            next_collection_date=next_date,
+            next_collection_day=next_date.strftime("%A") if next_date else None,
+            days_until_next=min(upcoming) if upcoming else None,
+            as_of=today,
+        )
+
+    @classmethod
+    def from_data(cls, data, today: date):
+        """Create a record from the plain data dict produced by the parser (or the cache)."""
+        data = data or {}
+        dates = {}
+        for key in COLLECTION_KEYS:
+            try:
+                dates[key] = date.fromisoformat(data[key]) if data.get(key) else None
+            except ValueError:
+                dates[key] = None
+        return cls.build(dates, data.get("geolocation_address"), data.get("next_collection_type"), today)
+
+    def for_day(self, today: date):
+        """Return this schedule with the day-relative values worked out for today."""
+        if today == self.as_of:
+            return self
+        return ScheduleRecord.build(self.dates, self.geolocation_address, self.next_collection_type, today)
+
+    def as_data(self) -> dict:
+        """Return the plain data dict form, as stored in the cache."""
+        return {
+            **self.iso_dates,
+            "geolocation_address": self.geolocation_address,
+            "next_collection_type": self.next_collection_type,
+        }
+
+    @property
+    def has_dates(self) -> bool:
+        """Whether any collection date was parsed."""
+        return any(self.dates.values())
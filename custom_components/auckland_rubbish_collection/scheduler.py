@@ -0,0 +1,138 @@
+import asyncio
+import zlib
+from datetime import timedelta
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_change, async_track_time_interval
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, DATA_SCHEDULER, _LOGGER
+
+SCAN_INTERVAL = timedelta(hours=5)
+TICK_INTERVAL = timedelta(minutes=1)
+MAX_CONCURRENT_FETCHES = 4
+MAX_CONCURRENT_PARSES = 2
+
+# Adaptive refresh planning
+MIN_REFRESH_INTERVAL = timedelta(hours=1)
+MAX_REFRESH_INTERVAL = timedelta(days=3)
+ROLLOVER_SPREAD = timedelta(hours=2)
+MAX_BACKOFF_STEPS = 8
+# Share of a backoff delay added per address, so addresses polled together drift apart
+BACKOFF_SPREAD = 0.25
+
+class AucklandRubbishFetchScheduler:
+    """
+    Drive refreshes for every configured address from a single shared timer.
+
+    Each coordinator plans its own next refresh from the dates it last parsed
+    (see plan_next_refresh); the scheduler checks those plans once a minute,
+    refreshes everything due as one batch, and caps concurrent council
+    requests at MAX_CONCURRENT_FETCHES.
+
+    Page parsing is handed off the event loop through async_parse, limited to
+    MAX_CONCURRENT_PARSES at a time (or the parse_concurrency set in
+    configuration.yaml) so fetching and parsing overlap.
+    """
+    def __init__(self, hass, interval=SCAN_INTERVAL, max_concurrent=MAX_CONCURRENT_FETCHES,
+                 max_concurrent_parses=MAX_CONCURRENT_PARSES):
+        self.hass = hass
+        self.interval = interval
+        self.fetch_semaphore = asyncio.Semaphore(max_concurrent)
+        self.parse_semaphore = asyncio.Semaphore(max_concurrent_parses)
+        self._coordinators = {}
+        self._unsub_tick = None
+        self._unsub_midnight = None
+
+    def offset(self, address_id, window: timedelta) -> timedelta:
+        """Return a stable offset for this address within window, to spread load."""
+        return timedelta(seconds=zlib.crc32(str(address_id).encode()) % int(window.total_seconds()))
+
+    def plan_next_refresh(self, address_id, record, unchanged=0, now=None):
+        """
+        Work out when an address next needs fetching.
+
+        The page only changes once a collection date has passed, so while every
+        parsed date is still upcoming we sleep until just after the earliest one.
+        Otherwise (a date has passed, or nothing was parsed) the council page is
+        due to roll over: poll from MIN_REFRESH_INTERVAL, doubling for each
+        unchanged result up to the scheduler interval. Either way each address
+        gets its own offset, so they are not all fetched in the same tick.
+        """
+        now = now or dt_util.now()
+        dates = [value for value in record.dates.values() if value] if record else []
+
+        if dates and min(dates) >= dt_util.as_local(now).date():
+            when = dt_util.start_of_local_day(min(dates) + timedelta(days=1))
+            when += self.offset(address_id, ROLLOVER_SPREAD)
+        else:
+            backoff = min(MIN_REFRESH_INTERVAL * 2 ** min(unchanged, MAX_BACKOFF_STEPS), self.interval)
+            when = now + backoff + self.offset(address_id, backoff * BACKOFF_SPREAD)
+
+        return min(when, now + MAX_REFRESH_INTERVAL)
+
+    @callback
+    def async_register(self, entry_id, coordinator):
+        """Add a coordinator to the shared schedule."""
+        self._coordinators[entry_id] = coordinator
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(self.hass, self._async_tick, TICK_INTERVAL)
+        if self._unsub_midnight is None:
+            # Local midnight, in Home Assistant's configured time zone
+            self._unsub_midnight = async_track_time_change(
+                self.hass, self._async_midnight, hour=0, minute=0, second=0
+            )
+
+    @callback
+    def async_unregister(self, entry_id):
+        """Remove a coordinator, stopping the timer once nothing is left."""
+        self._coordinators.pop(entry_id, None)
+        if not self._coordinators and self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        if not self._coordinators and self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+
+    async def async_parse(self, func, *args):
+        """Run a pure parse function in Home Assistant's executor threads."""
+        async with self.parse_semaphore:
+            return await self.hass.async_add_executor_job(func, *args)
+
+    @callback
+    def _async_tick(self, now):
+        """Collect every coordinator whose planned refresh has passed and refresh them as one batch."""
+        batch = []
+        for coordinator in self._coordinators.values():
+            if coordinator.next_refresh is None or coordinator.next_refresh <= now:
+                # Provisional, so a slow refresh is not picked up again; replaced once it completes
+                coordinator.next_refresh = now + self.interval
+                batch.append(coordinator)
+        if batch:
+            _LOGGER.debug("Refreshing %d address(es)", len(batch))
+            self.hass.async_create_background_task(
+                self._async_refresh_batch(batch), name=f"{DOMAIN} scheduled refresh"
+            )
+
+    @callback
+    def _async_midnight(self, now):
+        """Roll every address over to the new day from the data already held, without fetching."""
+        today = dt_util.as_local(now).date()
+        _LOGGER.debug("Rolling %d address(es) over to %s", len(self._coordinators), today)
+        for coordinator in self._coordinators.values():
+            coordinator.async_roll_over(today)
+
+    async def _async_refresh_batch(self, batch):
+        # Concurrency is capped by fetch_semaphore and parse_semaphore inside each coordinator
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in batch))
+
+def get_scheduler(hass, **kwargs) -> AucklandRubbishFetchScheduler:
+    """
+    Get or create the scheduler shared by all config entries; kwargs are only
+    used when it is created.
+    """
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = {}
+
+    if DATA_SCHEDULER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_SCHEDULER] = AucklandRubbishFetchScheduler(hass, **kwargs)
+
+    return hass.data[DOMAIN][DATA_SCHEDULER]
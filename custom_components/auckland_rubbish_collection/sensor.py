@@ -1,15 +1,11 @@
-import datetime
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.sensor import SensorDeviceClass
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
-from .const import DOMAIN, _LOGGER
+from .const import CONF_SINGLE_ENTITY, _LOGGER
+from .entity import AucklandRubbishEntity
+from .schedule import COLLECTION_KEYS
 from .service import get_coordinator
 
-def slugify(name: str) -> str:
-    """Convert a string into a slug safe for unique IDs."""
-    return name.lower().replace(" ", "_")
-
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the rubbish collection sensors."""
     _LOGGER.debug("Setting up sensors for entry: %s", entry.title)
@@ -17,23 +13,29 @@ async def async_setup_entry(hass, entry, async_add_entities):
     # Get the coordinator
     coordinator = get_coordinator(hass, entry)
 
+    if entry.options.get(CONF_SINGLE_ENTITY, False):
+        # One entity carrying every date, instead of one entity per value
+        async_add_entities([RubbishCollectionSensor(coordinator, "schedule")])
+        return
+
     async_add_entities([
         RubbishCollectionSensor(coordinator, "rubbish"),
         RubbishCollectionSensor(coordinator, "recycling"),
         RubbishCollectionSensor(coordinator, "food_scraps"),
         RubbishCollectionSensor(coordinator, "geolocation_address"),
-        RubbishCollectionSensor(coordinator, "next_collection_type")
+        RubbishCollectionSensor(coordinator, "refresh_time"),
+        RubbishCollectionSensor(coordinator, "response_size"),
+        RubbishCollectionSensor(coordinator, "next_collection_type"),
+        RubbishCollectionSensor(coordinator, "days_until"),
+        RubbishCollectionSensor(coordinator, "next_refresh")
     ])
 
-class RubbishCollectionSensor(CoordinatorEntity, SensorEntity):
+class RubbishCollectionSensor(AucklandRubbishEntity, SensorEntity):
     """Representation of a rubbish collection sensor."""
     def __init__(self, coordinator, sensor_type):
-        super().__init__(coordinator)
         self.sensor_type = sensor_type
         _LOGGER.debug("Adding Sensor: %s", self.sensor_type)
-        # Use slugified address_name for unique IDs
-        self._attr_name = f"{coordinator.address_name} {sensor_type.replace('_', ' ').title()}"
-        self._attr_unique_id = f"{DOMAIN}_{slugify(coordinator.address_name)}_{sensor_type}"
+        super().__init__(coordinator, sensor_type, sensor_type.replace('_', ' ').title())
 
         if sensor_type in ("rubbish", "recycling", "foodscraps"):
             self._attr_device_class = SensorDeviceClass.DATE
@@ -42,13 +44,52 @@ class RubbishCollectionSensor(CoordinatorEntity, SensorEntity):
             self.entity_registry_enabled_default = False
             self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    @property
-    def state(self):
-        return self.coordinator.data.get(self.sensor_type, None)
+        if sensor_type in ("refresh_time", "response_size"):
+            # Per refresh instrumentation, see RefreshStats
+            self.entity_registry_enabled_default = False
+            self._attr_entity_category = EntityCategory.DIAGNOSTIC
+            self._attr_native_unit_of_measurement = "ms" if sensor_type == "refresh_time" else "B"
+
+        if sensor_type == "days_until":
+            self._attr_native_unit_of_measurement = "d"
+
+        if sensor_type == "next_refresh":
+            self._attr_device_class = SensorDeviceClass.TIMESTAMP
+            self.entity_registry_enabled_default = False
+            self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+        if sensor_type == "schedule":
+            self._attr_device_class = SensorDeviceClass.DATE
 
-    @property
-    def icon(self):
-        """Return the icon to use for the sensor."""
+    def _compute_values(self) -> tuple:
+        return (self.coordinator.data is not None, self._native_value(), self._icon(), self._attributes())
+
+    def _apply_values(self, values) -> None:
+        _, self._attr_native_value, self._attr_icon, self._attr_extra_state_attributes = values
+
+    def _native_value(self):
+        if self.sensor_type == "next_refresh":
+            # Planned by the coordinator rather than parsed from the council page
+            return self.coordinator.next_refresh
+        if self.sensor_type in ("refresh_time", "response_size"):
+            stats = self.coordinator.last_stats
+            if stats is None:
+                return None
+            if self.sensor_type == "refresh_time":
+                return round(stats.total_ms)
+            return stats.bytes_received
+        record = self.coordinator.data
+        if record is None:
+            return None
+        if self.sensor_type in COLLECTION_KEYS:
+            return record.dates[self.sensor_type]
+        if self.sensor_type == "days_until":
+            return record.days_until_next
+        if self.sensor_type == "schedule":
+            return next_collection_date(record)
+        return getattr(record, self.sensor_type)
+
+    def _icon(self):
         if self.sensor_type == "rubbish":
             return "mdi:trash-can"
         if self.sensor_type == "recycling":
@@ -57,8 +98,19 @@ class RubbishCollectionSensor(CoordinatorEntity, SensorEntity):
             return "mdi:compost"
         if self.sensor_type == "geolocation_address":
             return "mdi:map-marker"
+        if self.sensor_type == "next_refresh":
+            return "mdi:update"
+        if self.sensor_type == "days_until":
+            return "mdi:calendar-clock"
+        if self.sensor_type == "refresh_time":
+            return "mdi:timer-outline"
+        if self.sensor_type == "response_size":
+            return "mdi:download-network-outline"
+        if self.sensor_type == "schedule":
+            return "mdi:calendar"
         if self.sensor_type == "next_collection_type":
-            collection_type = self.coordinator.data.get(self.sensor_type, "Unknown")
+            record = self.coordinator.data
+            collection_type = (record.next_collection_type if record else None) or "Unknown"
             if "Rubbish & Recycling" in collection_type:
                 return "mdi:recycle"
             elif "Rubbish" in collection_type:
@@ -69,69 +121,70 @@ class RubbishCollectionSensor(CoordinatorEntity, SensorEntity):
                 return "mdi:calendar"
         return "mdi:help-circle"  # Default fallback icon
 
-    @property
-    def extra_state_attributes(self) -> dict[str, str]:
-        """Return extra attributes for the sensor."""
-
-        if self.sensor_type in ("rubbish", "recycling", "food_scraps"):
-            attributes = {}
-            value = self.coordinator.data.get(self.sensor_type, None)
-            if value:
-                try:
-                    # Parse as a pure date (no timezone)
-                    date_only = datetime.datetime.strptime(value, "%Y-%m-%d").date()
-                    day_name = date_only.strftime("%A")
-                    attributes["collection_day"] = day_name
-                    _LOGGER.debug(
-                        "Adding attribute to Sensor [%s] collection_day: %s",
-                        self.sensor_type,
-                        day_name,
-                    )
-                except ValueError as e:
-                    pass
-            return attributes
-
-        if self.sensor_type == "next_collection_type":
-            attributes = {}
-            next_type = self.coordinator.data.get(self.sensor_type, None)
-
-            # Normalize key to match coordinator structure
-            key_map = {
-                "Rubbish": "rubbish",
-                "Rubbish & Recycling": "recycling"
-            }
-
-            lookup_key = key_map.get(next_type)
-            next_date = self.coordinator.data.get(lookup_key) if lookup_key else None
-
-            if next_date:
-                try:
-                    # Parse as a pure date (no timezone, no datetime)
-                    date_only = datetime.datetime.strptime(next_date, "%Y-%m-%d").date()
-                    day_name = date_only.strftime("%A")
-
-                    attributes["date"] = next_date
-                    attributes["day"] = day_name
-
-                    _LOGGER.debug(
-                        "Adding day/date attributes to Sensor [%s]",
-                        self.sensor_type,
-                    )
-                except ValueError:
-                    _LOGGER.warning(
-                        "Invalid ISO date when adding day/date attributes to Sensor [%s]: %s",
-                        self.sensor_type,
-                        next_date,
-                    )
-            return attributes
-
-    @property
-    def device_info(self):
-        """Return device information for this integration."""
-        return {
-            "identifiers": {(DOMAIN, slugify(self.coordinator.address_name))},
-            "name": self.coordinator.address_name,
-            "manufacturer": "Auckland Council",
-            "model": "Rubbish Collection Service",
-            "entry_type": "service",  # This indicates it's a service, not a device
-        }
+    def _attributes(self) -> dict:
+        record = self.coordinator.data
+        attributes = {}
+
+        if self.sensor_type in COLLECTION_KEYS:
+            if record and record.weekdays[self.sensor_type]:
+                attributes["collection_day"] = record.weekdays[self.sensor_type]
+                attributes["days_until"] = record.days_until[self.sensor_type]
+
+        elif self.sensor_type == "next_collection_type":
+            if record and record.next_collection_date:
+                attributes["date"] = record.next_collection_date.isoformat()
+                attributes["day"] = record.next_collection_day
+                attributes["days_until"] = (record.next_collection_date - record.as_of).days
+
+        elif self.sensor_type == "schedule":
+            if record:
+                # Everything the separate entities show, for installs with many addresses
+                for key in COLLECTION_KEYS:
+                    attributes[key] = record.iso_dates[key]
+                    attributes[f"{key}_day"] = record.weekdays[key]
+                    attributes[f"{key}_days_until"] = record.days_until[key]
+                attributes["next_collection_type"] = record.next_collection_type
+                attributes["days_until"] = record.days_until_next
+                attributes["collection_today"] = 0 in record.days_until.values()
+                attributes["collection_tomorrow"] = 1 in record.days_until.values()
+                attributes["geolocation_address"] = record.geolocation_address
+
+        elif self.sensor_type == "next_refresh":
+            fetcher = self.coordinator.fetcher
+            mean_latency = fetcher.mean_latency
+            attributes.update({
+                "conditional_hits": fetcher.conditional_hits,
+                "conditional_misses": fetcher.conditional_misses,
+                "requests": fetcher.requests,
+                "retries": fetcher.retries,
+                "failures": fetcher.failures,
+                "last_latency_ms": round(fetcher.last_latency) if fetcher.last_latency is not None else None,
+                "mean_latency_ms": round(mean_latency) if mean_latency is not None else None,
+                "circuit_breaker": fetcher.breaker.state,
+            })
+
+        elif self.sensor_type == "refresh_time":
+            stats = self.coordinator.last_stats
+            if stats:
+                totals = [previous.total_ms for previous in self.coordinator.stats]
+                attributes.update({
+                    "cache": stats.cache,
+                    "network_ms": round(stats.network_ms) if stats.network_ms is not None else None,
+                    "parse_ms": round(stats.parse_ms, 1) if stats.parse_ms is not None else None,
+                    "date_parse_ms": round(stats.date_parse_ms, 2) if stats.date_parse_ms is not None else None,
+                    "mean_ms": round(sum(totals) / len(totals)),
+                    "max_ms": round(max(totals)),
+                    "refreshes": len(totals),
+                })
+
+        # The last good schedule, kept while the council site can't be reached
+        attributes["stale"] = self.coordinator.stale
+        return attributes
+
+def next_collection_date(record):
+    """The earliest collection today or later, of any kind."""
+    upcoming = [
+        record.dates[key] for key, days in record.days_until.items()
+        if days is not None and days >= 0
+    ]
+    return min(upcoming) if upcoming else None
@@ -1,152 +1,432 @@
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
-from datetime import date, timedelta
-from dateutil import parser
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+import random
+import time
+from collections import deque
+from dataclasses import replace
+from datetime import timedelta
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN, _LOGGER
+from homeassistant.util import dt as dt_util
+from .breaker import RESET_TIMEOUT, STATE_OPEN, get_circuit_breaker
+from .cache import get_schedule_cache
+from .const import DOMAIN, DATA_FETCHERS, CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE, _LOGGER
+from .parsing import DEFAULT_EXTRACTION_ENGINE, ScheduleBoundary, parse_schedule_page_timed
+from .schedule import ScheduleRecord
+from .scheduler import get_scheduler
+from .stats import (
+    CACHE_ERROR,
+    CACHE_MISS,
+    CACHE_NOT_MODIFIED,
+    CACHE_SHARED,
+    CACHE_UNCHANGED,
+    STATS_HISTORY,
+    RefreshStats,
+)
 
-SCAN_INTERVAL = timedelta(hours=5)
 BASE_URL = "https://www.aucklandcouncil.govt.nz"
+PAGE_PATH = (
+    "/en/rubbish-recycling/rubbish-recycling-collections/"
+    "rubbish-recycling-collection-days/{address_id}.html"
+)
+REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0 Safari/537.36"
+    ),
+    "Accept": (
+        "text/html,application/xhtml+xml,application/xml;"
+        "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
+    ),
+    "Accept-Language": "en-NZ,en;q=0.9",
+    "Referer": f"{BASE_URL}/en/rubbish-recycling/"
+               "rubbish-recycling-collections/"
+               "rubbish-recycling-collection-days.html",
+    "Sec-Fetch-Site": "same-origin",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Dest": "document",
+}
 
-class AucklandRubbishCollectionCoordinator(DataUpdateCoordinator):
-    """Fetch rubbish collection data periodically."""
-    def __init__(self, hass, address_id, address_name="Address"):
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=SCAN_INTERVAL)
+CHUNK_SIZE = 16 * 1024
+
+# A result this recent is shared with other entries for the address instead of refetching
+COALESCE_WINDOW = timedelta(minutes=1)
+
+# Each request (including reading the body) is given up on after REQUEST_TIMEOUT.
+# Network errors and these statuses are retried up to MAX_ATTEMPTS times in all,
+# waiting a random time of up to RETRY_BASE_DELAY seconds, doubled for each retry.
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+COLLECTION_KEYS = ("rubbish", "recycling", "food_scraps")
+
+class ScheduleNotFound(UpdateFailed):
+    """The council site answered, but its page held no collection schedule."""
+    def __init__(self, address_id, geolocation_address=None):
+        super().__init__(f"No collection schedule found on the council site for address {address_id}")
+        self.geolocation_address = geolocation_address
+
+async def async_read_page(response) -> bytes:
+    """
+    Read the response body, stopping as soon as the schedule block has closed
+    so the rest of the page is never downloaded. A block without any schedule
+    entries is read past, to the end of the page. Parsing happens separately.
+    """
+    body = bytearray()
+    boundary = ScheduleBoundary()
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        body += chunk
+        if boundary.scan(body):
+            break
+    return bytes(body)
+
+class AucklandRubbishAddressFetcher:
+    """
+    Fetch and parse the council page for one address on behalf of every config
+    entry that uses it. Concurrent refreshes share one in-flight request, and a
+    result from the last COALESCE_WINDOW is handed out again instead of refetched.
+    Each entry holds a reference (see acquire_fetcher and release_fetcher).
+    """
+    def __init__(self, hass, address_id, scheduler=None, base_url=BASE_URL):
         self.hass = hass
         self.address_id = address_id
-        self.address_name = address_name
+        # Pointed elsewhere to replay recorded pages (see benchmarks/replay.py)
+        self.base_url = base_url
+        self.scheduler = scheduler or get_scheduler(hass)
+        self.breaker = get_circuit_breaker(hass)
+        self.cache = get_schedule_cache(hass)
+        self.extraction_engine = DEFAULT_EXTRACTION_ENGINE
+        self.refs = 0
+        # The last parsed schedule data, and when it was confirmed current
+        self.data = None
+        self.fetched = None
+        self._task = None
+        # Conditional request state, from the response the current data was parsed from
+        self._etag = None
+        self._last_modified = None
+        self._digest = None
+        self.conditional_hits = 0
+        self.conditional_misses = 0
+        # Request counters; latency is for the request and body read, in milliseconds
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.last_latency = None
+        self._total_latency = 0.0
+
+    @property
+    def mean_latency(self):
+        return self._total_latency / self.requests if self.requests else None
+
+    async def async_fetch(self):
+        """
+        Return the current schedule data for this address, fetching it unless that
+        just happened, as (data, RefreshStats).
+        """
+        if self._task is None:
+            if self.fetched is not None and dt_util.utcnow() - self.fetched < COALESCE_WINDOW:
+                return self.data, RefreshStats(dt_util.utcnow(), CACHE_SHARED)
+            self._task = self.hass.async_create_task(
+                self._async_fetch(), f"{DOMAIN} fetch {self.address_id}"
+            )
+            self._task.add_done_callback(self._async_fetch_done)
+        # Shielded, so one caller being cancelled doesn't cancel the fetch for the others
+        return await asyncio.shield(self._task)
 
-    def parse_collection_date(self, text: str) -> str | None:
-        """Convert collection text (e.g., 'Thursday, 13 March') into ISO 8601 format ('YYYY-MM-DD')"""
+    @callback
+    def async_close(self):
+        """Cancel any fetch in flight; called once the last entry has released this address."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
 
+    @callback
+    def _async_fetch_done(self, task):
+        if self._task is task:
+            self._task = None
+
+    @callback
+    def _async_reuse_data(self, stats):
+        """Skip parsing and keep the current data when the council page has not changed."""
+        self.conditional_hits += 1
+        _LOGGER.debug(
+            "Schedule for %s %s, reusing previous data (%d hits, %d misses)",
+            self.address_id,
+            stats.cache.replace("_", " "),
+            self.conditional_hits,
+            self.conditional_misses,
+        )
+        self.fetched = dt_util.utcnow()
+        self.cache.async_set(self.address_id, self.data)
+        return self.data, stats
+
+    async def _async_fetch(self):
+        if not self.breaker.async_allow():
+            raise UpdateFailed(
+                f"Council site unavailable, not fetching until {self.breaker.open_until}"
+            )
+        # Let through while the breaker has been open, so this is its trial fetch
+        trial = self.breaker.open_until is not None
         try:
-            parsed = parser.parse(text, dayfirst=True)
-            # Year rollover fix:
-            # If today is December and the parsed month is January,
-            # assume the date refers to next year.
-            today = date.today()
-            if today.month == 12 and parsed.month == 1:
+            data = await self._async_fetch_with_retry()
+        except aiohttp.ClientResponseError as err:
+            self.failures += 1
+            if err.status in RETRY_STATUSES:
+                self.breaker.async_record_failure()
+            else:
+                # The site answered (e.g. 404 for an unknown address), so it isn't down
+                self.breaker.async_record_success()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.failures += 1
+            self.breaker.async_record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Unloaded or shutting down; says nothing about the council site
+            if trial:
+                self.breaker.async_end_trial()
+            raise
+        except Exception:
+            # Not a network failure (e.g. the page held no schedule), so the breaker isn't told
+            self.failures += 1
+            if trial:
+                self.breaker.async_end_trial()
+            raise
+        self.breaker.async_record_success()
+        return data
+
+    async def _async_fetch_with_retry(self):
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                return await self._async_fetch_once()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if isinstance(err, aiohttp.ClientResponseError) and err.status not in RETRY_STATUSES:
+                    raise
+                if attempt == MAX_ATTEMPTS or self.breaker.state == STATE_OPEN:
+                    raise
+                # Full jitter, so addresses that failed together don't retry together
+                delay = random.uniform(0, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                self.retries += 1
                 _LOGGER.debug(
-                    "Year rollover detected for '%s': parsed month=January while today is in December. "
-                    "Adjusting year from %s to %s.",
-                    text,
-                    parsed.year,
-                    parsed.year + 1,
+                    "Fetch %d for address %s failed (%s), retrying in %.1fs",
+                    attempt,
+                    self.address_id,
+                    err or type(err).__name__,
+                    delay,
                 )
-                parsed = parsed.replace(year=today.year + 1)
+                await asyncio.sleep(delay)
 
-            return parsed.date().isoformat()
+    async def _async_fetch_once(self):
+        url = self.base_url + PAGE_PATH.format(address_id=self.address_id)
+        headers = dict(REQUEST_HEADERS)
+        # Validators are only kept for the page the current data was parsed from
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        session = async_get_clientsession(self.hass)
+        started = dt_util.utcnow()
+        try:
+            async with self.scheduler.fetch_semaphore:
+                _LOGGER.debug("Fetching collection data for address: %s", self.address_id)
+                self.requests += 1
+                start = time.monotonic()
+                try:
+                    async with session.get(url, headers=headers, timeout=REQUEST_TIMEOUT) as response:
+                        if response.status == 304 and self.data is not None:
+                            body = None
+                        else:
+                            response.raise_for_status()
+                            body = await async_read_page(response)
+                            charset = response.charset
+                            etag = response.headers.get("ETag")
+                            last_modified = response.headers.get("Last-Modified")
+                finally:
+                    self.last_latency = (time.monotonic() - start) * 1000
+                    self._total_latency += self.last_latency
+
+            if body is None:
+                return self._async_reuse_data(RefreshStats(
+                    started, CACHE_NOT_MODIFIED, network_ms=self.last_latency, bytes_received=0
+                ))
+
+            # Parse off the event loop; data is None if the extracted schedule is unchanged
+            digest, data, timings = await self.scheduler.async_parse(
+                parse_schedule_page_timed,
+                body,
+                charset,
+                dt_util.now().date(),
+                self.extraction_engine,
+                self._digest,
+            )
+            stats = RefreshStats(
+                started,
+                CACHE_MISS if data is not None else CACHE_UNCHANGED,
+                network_ms=self.last_latency,
+                bytes_received=len(body),
+                parse_ms=timings["parse"] * 1000,
+                date_parse_ms=timings["date_parse"] * 1000 if "date_parse" in timings else None,
+            )
+            if data is None:
+                self._etag, self._last_modified = etag, last_modified
+                return self._async_reuse_data(stats)
+            if not any(data.get(key) for key in COLLECTION_KEYS):
+                # A maintenance page or a cut off body; the last good schedule stays as it was
+                raise ScheduleNotFound(self.address_id, data.get("geolocation_address"))
+            self.conditional_misses += 1
+
+            self._etag, self._last_modified, self._digest = etag, last_modified, digest
+            self.data, self.fetched = data, dt_util.utcnow()
+            self.cache.async_set(self.address_id, data)
+            return data, stats
+        except ScheduleNotFound:
+            raise
         except Exception:
-            return None
+            self._etag = self._last_modified = self._digest = None
+            raise
 
-    def parse_collection_address(self, soup: BeautifulSoup) -> str:
+class AucklandRubbishCollectionCoordinator(DataUpdateCoordinator):
+    """Fetch rubbish collection data when triggered by the shared scheduler."""
+    def __init__(self, hass, address_id, address_name="Address", scheduler=None,
+                 cache_max_age=timedelta(days=DEFAULT_CACHE_MAX_AGE), fetcher=None):
+        # No update_interval: refreshes are driven by the shared scheduler
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=None)
+        self.hass = hass
+        self.address_id = address_id
+        self.address_name = address_name
+        self.scheduler = scheduler or get_scheduler(hass)
+        self.fetcher = fetcher or AucklandRubbishAddressFetcher(hass, address_id, self.scheduler)
+        self.cache = get_schedule_cache(hass)
+        self.cache_max_age = cache_max_age
+        self.next_refresh = None
+        self._unchanged_refreshes = 0
+        # The fetcher's data dict the current record was built from
+        self._source = None
+        # The most recent refreshes, oldest first
+        self.stats = deque(maxlen=STATS_HISTORY)
+
+    @property
+    def stale(self) -> bool:
+        """Whether the data held is the last good schedule, kept while fetching fails."""
+        return self.data is not None and not self.last_update_success
+
+    @property
+    def last_stats(self):
+        return self.stats[-1] if self.stats else None
+
+    @callback
+    def async_restore_from_cache(self):
         """
-        Extracts the full address block from the HTML text.
-        Returns a string like '100A My Street, Auckland, Auckland 1001'.
+        Seed the coordinator with the last persisted schedule for this address.
+        Returns when that schedule was fetched, or None if nothing usable was cached.
         """
-        address_block = soup.find("h2")
-        if not address_block:
-            return "Unknown address"
-
-        street = address_block.find("span", class_="heading")
-        suburb = address_block.find("span", class_="subheading")
-
-        if street and suburb:
-            return f"{street.get_text(strip=True)}, {suburb.get_text(strip=True)}"
-        elif street:
-            return street.get_text(strip=True)
-        elif suburb:
-            return suburb.get_text(strip=True)
+        cached = self.cache.async_get(self.address_id, self.cache_max_age)
+        if cached is None:
+            return None
+        data, fetched = cached
+        _LOGGER.debug("Restored cached schedule for %s (fetched %s)", self.address_name, fetched)
+        record = ScheduleRecord.from_data(data, dt_util.now().date())
+        # Plan as if we had just fetched it, so a stale cache is refreshed straight away
+        self.next_refresh = self.scheduler.plan_next_refresh(self.address_id, record, now=fetched)
+        self.async_set_updated_data(record)
+        return fetched
+
+    @callback
+    def async_roll_over(self, today):
+        """Recompute the day-relative values (today, tomorrow, days until) for a new day."""
+        if self.data is None or self.data.as_of == today:
+            return
+        self.data = self.data.for_day(today)
+        self.async_update_listeners()
+
+    @callback
+    def _async_plan_next_refresh(self, record, failed=False):
+        """Track whether the schedule changed and plan the next fetch accordingly."""
+        if failed or (self.data is not None and record.as_data() == self.data.as_data()):
+            self._unchanged_refreshes += 1
         else:
-            return address_block.get_text(strip=True)
+            self._unchanged_refreshes = 0
+        self.next_refresh = self.scheduler.plan_next_refresh(
+            self.address_id, record, self._unchanged_refreshes
+        )
+        _LOGGER.debug(
+            "Next refresh for %s planned at %s (%d unchanged)",
+            self.address_name,
+            self.next_refresh,
+            self._unchanged_refreshes,
+        )
+
+    @callback
+    def _async_record_stats(self, stats, start):
+        stats = replace(stats, total_ms=(time.monotonic() - start) * 1000)
+        self.stats.append(stats)
+        _LOGGER.debug(
+            "Refreshed %s in %.0fms (%s; network %s, %s bytes, parse %s, dates %s)",
+            self.address_name,
+            stats.total_ms,
+            stats.cache,
+            f"{stats.network_ms:.0f}ms" if stats.network_ms is not None else "-",
+            stats.bytes_received if stats.bytes_received is not None else "-",
+            f"{stats.parse_ms:.1f}ms" if stats.parse_ms is not None else "-",
+            f"{stats.date_parse_ms:.2f}ms" if stats.date_parse_ms is not None else "-",
+        )
 
     async def _async_update_data(self):
-        url = f"{BASE_URL}/en/rubbish-recycling/rubbish-recycling-collections/rubbish-recycling-collection-days/{self.address_id}.html"
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0 Safari/537.36"
-            ),
-            "Accept": (
-                "text/html,application/xhtml+xml,application/xml;"
-                "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
-            ),
-            "Accept-Language": "en-NZ,en;q=0.9",
-            "Referer": f"{BASE_URL}/en/rubbish-recycling/"
-                       "rubbish-recycling-collections/"
-                       "rubbish-recycling-collection-days.html",
-            "Sec-Fetch-Site": "same-origin",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Dest": "document",
-        }
-        session = async_get_clientsession(self.hass)
+        today = dt_util.now().date()
+        started, start = dt_util.utcnow(), time.monotonic()
         try:
-            _LOGGER.debug("Fetching collection data for entry: %s", self.address_name)
-            async with session.get(url, headers=headers) as response:
-                response_text = await response.text()
-                _LOGGER.debug("Response: (status %s)\n%s",
-                    response.status,
-                    response_text[:200]
-                )
-            soup = BeautifulSoup(response_text, "html.parser")
-
-            # Extract geolocation address
-            geolocation_address = self.parse_collection_address(soup)
-
-            # Initialize collection dates
-            rubbish, recycling, food_scraps = None, None, None
-
-            # Extract collection information
-            collection_cards = soup.find_all("div", class_="acpl-schedule-card")
-            collection_info = []
-            for card in collection_cards:
-                bin_entries = card.find_all("p", class_="mb-0 lead")
-                for entry in bin_entries:
-                    collection_info.append(entry)
-
-            if not collection_info:
-                _LOGGER.error("Unexpected response format: no collection data found")
-
-            # Parse each collection entry and assign to the correct type based on keywords
-            for entry in collection_info:
-                text = entry.get_text(strip=True)
-                if "rubbish" in text.lower():
-                    raw_date = text.split(":", 1)[-1].strip() if ":" in text else text
-                    rubbish = self.parse_collection_date(raw_date)
-                elif "recycling" in text.lower():
-                    raw_date = text.split(":", 1)[-1].strip() if ":" in text else text
-                    recycling = self.parse_collection_date(raw_date)
-                elif "food scraps" in text.lower():
-                    raw_date = text.split(":", 1)[-1].strip() if ":" in text else text
-                    food_scraps = self.parse_collection_date(raw_date)
-
-            # Determine next collection type
-            try:
-                if rubbish and recycling:
-                    if rubbish == recycling:
-                        next_collection_type = "Rubbish & Recycling"
-                    else:
-                        next_collection_type = "Rubbish"
-                elif rubbish:
-                        next_collection_type = "Rubbish"
-                else:
-                    next_collection_type = None
-            except Exception:
-                next_collection_type = None
-
-            return {
-                "rubbish": rubbish,
-                "recycling": recycling,
-                "food_scraps": food_scraps,
-                "geolocation_address": geolocation_address,
-                "next_collection_type": next_collection_type
-            }
-        except Exception as e:
-            _LOGGER.error("Error fetching rubbish collection data: %s", e)
-            return {}
+            data, stats = await self.fetcher.async_fetch()
+        except Exception as err:
+            self._async_record_stats(
+                RefreshStats(started, CACHE_ERROR, error=str(err) or type(err).__name__), start
+            )
+            # The coordinator keeps the last good schedule; entities show it marked as stale
+            self._async_plan_next_refresh(self.data, failed=True)
+            open_until = self.fetcher.breaker.open_until
+            if open_until is not None and self.next_refresh < open_until:
+                self.next_refresh = open_until + self.scheduler.offset(self.address_id, RESET_TIMEOUT)
+            if isinstance(err, UpdateFailed):
+                raise
+            raise UpdateFailed(f"Council site request failed: {err or type(err).__name__}") from err
+        self._async_record_stats(stats, start)
+
+        if self.data is not None and data is self._source:
+            # Same parsed result as last time (page unchanged), so only the day may have moved on
+            record = self.data.for_day(today)
+        else:
+            record = ScheduleRecord.from_data(data, today)
+        self._source = data
+        self._async_plan_next_refresh(record)
+        return record
+
+def acquire_fetcher(hass, address_id) -> AucklandRubbishAddressFetcher:
+    """Get the fetcher shared by every entry for this address, taking a reference on it."""
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = {}
+    fetchers = hass.data[DOMAIN].setdefault(DATA_FETCHERS, {})
+
+    if address_id not in fetchers:
+        fetchers[address_id] = AucklandRubbishAddressFetcher(hass, address_id)
+
+    fetcher = fetchers[address_id]
+    fetcher.refs += 1
+    return fetcher
+
+def release_fetcher(hass, address_id):
+    """Drop a reference on an address's fetcher, closing it once no entry uses it."""
+    fetchers = hass.data.get(DOMAIN, {}).get(DATA_FETCHERS, {})
+    fetcher = fetchers.get(address_id)
+    if fetcher is None:
+        return
+    fetcher.refs -= 1
+    if fetcher.refs <= 0:
+        _LOGGER.debug("Last entry for address %s unloaded, closing its fetcher", address_id)
+        fetcher.async_close()
+        del fetchers[address_id]
 
 def get_coordinator(hass, entry):
     """Get or create a coordinator for the given entry."""
@@ -159,8 +439,15 @@ def get_coordinator(hass, entry):
     # Get address_id from options if available, otherwise from data
     address_id = entry.options.get("address_id", entry.data.get("address_id"))
     address_name = entry.data.get("address_name", address_id)
+    cache_max_age = timedelta(days=entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE))
 
-    coordinator = AucklandRubbishCollectionCoordinator(hass, address_id, address_name)
+    scheduler = get_scheduler(hass)
+    # Entries for the same address share one fetcher; coordinators stay per entry for naming
+    coordinator = AucklandRubbishCollectionCoordinator(
+        hass, address_id, address_name, scheduler, cache_max_age,
+        fetcher=acquire_fetcher(hass, address_id),
+    )
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    scheduler.async_register(entry.entry_id, coordinator)
 
     return coordinator
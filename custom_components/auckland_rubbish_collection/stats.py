@@ -0,0 +1,31 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+# Refreshes kept per entry
+STATS_HISTORY = 20
+
+# How each refresh got its schedule
+CACHE_MISS = "miss"  # page downloaded and parsed
+CACHE_NOT_MODIFIED = "not_modified"  # 304 from the council site
+CACHE_UNCHANGED = "unchanged"  # page downloaded, extracted schedule unchanged
+CACHE_SHARED = "shared"  # another entry for the address had just fetched it
+CACHE_ERROR = "error"  # nothing usable, the previous schedule was kept
+
+@dataclass(frozen=True, slots=True)
+class RefreshStats:
+    """
+    Where the time went in one refresh. Times are in milliseconds; total_ms
+    includes waiting for a fetch or parse slot, so it can exceed the stages.
+    """
+    started: datetime
+    cache: str
+    total_ms: float = 0.0
+    network_ms: float | None = None
+    bytes_received: int | None = None
+    parse_ms: float | None = None
+    date_parse_ms: float | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        """Return a JSON friendly dict, for diagnostics downloads."""
+        return {**asdict(self), "started": self.started.isoformat()}